@@ -0,0 +1,169 @@
+import numpy as np
+
+from nbody import G
+
+# --- TREE LAYOUT ---
+# The quadtree is built level by level from Morton-sorted particles, so every node
+# owns a contiguous slice of the sorted arrays and every level is a handful of
+# vectorized reductions instead of a Python recursion per node.
+MAX_DEPTH = 16
+TARGET_CHUNK = 4096
+
+
+def _spread_bits(v):
+    v = v.astype(np.uint64)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x33333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x55555555)
+    return v
+
+
+class QuadTree:
+    def __init__(self, pos, mass, max_depth=MAX_DEPTH):
+        lo = pos.min(axis=0)
+        size = float((pos.max(axis=0) - lo).max()) * (1 + 1e-9) or 1.0
+        cells = np.clip(((pos - lo) / size * (1 << max_depth)).astype(np.int64), 0, (1 << max_depth) - 1)
+        keys = _spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        self.pos = pos[order]
+        self.mass = mass[order]
+        weighted = self.pos * self.mass[:, np.newaxis]
+
+        starts, counts, masses, coms, sizes, leaves, level_keys = [], [], [], [], [], [], []
+        for level in range(max_depth + 1):
+            level_key = keys >> np.uint64(2 * (max_depth - level))
+            start = np.flatnonzero(np.r_[True, level_key[1:] != level_key[:-1]])
+            count = np.diff(np.r_[start, len(keys)])
+            node_mass = np.add.reduceat(self.mass, start)
+            safe_mass = np.where(node_mass > 0, node_mass, 1)
+            starts.append(start)
+            counts.append(count)
+            masses.append(node_mass)
+            coms.append(np.add.reduceat(weighted, start) / safe_mass[:, np.newaxis])
+            sizes.append(np.full(len(start), size / (1 << level)))
+            leaves.append((count == 1) | (level == max_depth))
+            level_keys.append(level_key[start])
+            if leaves[-1].all():
+                break
+
+        # Children of a node are the contiguous run of next-level nodes sharing its key prefix.
+        offsets = np.cumsum([0] + [len(s) for s in starts])
+        child_start = [np.zeros(len(s), dtype=np.int64) for s in starts]
+        child_count = [np.zeros(len(s), dtype=np.int64) for s in starts]
+        for level in range(len(starts) - 1):
+            parent_keys = level_keys[level + 1] >> np.uint64(2)
+            first = np.searchsorted(parent_keys, level_keys[level], side="left")
+            last = np.searchsorted(parent_keys, level_keys[level], side="right")
+            child_start[level] = offsets[level + 1] + first
+            child_count[level] = np.where(leaves[level], 0, last - first)
+
+        self.start = np.concatenate(starts)
+        self.count = np.concatenate(counts)
+        self.node_mass = np.concatenate(masses)
+        self.com = np.concatenate(coms)
+        self.size = np.concatenate(sizes)
+        self.leaf = np.concatenate(leaves)
+        self.child_start = np.concatenate(child_start)
+        self.child_count = np.concatenate(child_count)
+
+    def accelerations(self, targets, theta=0.5, softening=0.0, potential=None):
+        """Acceleration at each target point from every particle in the tree.
+
+        A node is used as a point mass when size / distance < theta; leaves are
+        summed particle by particle, skipping zero-distance (self) pairs. If a
+        `potential` array is given, the potential at each target is added to it.
+        """
+        acc = np.zeros_like(targets)
+        for lo in range(0, len(targets), TARGET_CHUNK):
+            chunk = slice(lo, lo + TARGET_CHUNK)
+            acc[chunk] = self._accelerations_chunk(targets[chunk], theta, softening,
+                                                   None if potential is None else potential[chunk])
+        return acc
+
+    def _accelerations_chunk(self, targets, theta, softening, potential):
+        eps_sq = softening**2
+        m = len(targets)
+        ax = np.zeros(m)
+        ay = np.zeros(m)
+        tgt = np.arange(m)
+        node = np.zeros(m, dtype=np.int64)
+        while len(tgt):
+            delta = self.com[node] - targets[tgt]
+            dist_sq = np.einsum("ij,ij->i", delta, delta)
+            is_leaf = self.leaf[node]
+            far = ~is_leaf & (self.size[node] ** 2 < theta**2 * dist_sq)
+
+            if far.any():
+                inv_dist = (dist_sq[far] + eps_sq) ** -0.5
+                g_over_r = G * self.node_mass[node[far]] * inv_dist
+                w = g_over_r * inv_dist**2
+                if potential is not None:
+                    potential -= np.bincount(tgt[far], weights=g_over_r, minlength=m)
+                ax += np.bincount(tgt[far], weights=w * delta[far, 0], minlength=m)
+                ay += np.bincount(tgt[far], weights=w * delta[far, 1], minlength=m)
+
+            if is_leaf.any():
+                leaf_tgt, leaf_node = tgt[is_leaf], node[is_leaf]
+                reps = self.count[leaf_node]
+                pair_tgt = np.repeat(leaf_tgt, reps)
+                first = np.repeat(self.start[leaf_node], reps)
+                within = np.arange(len(pair_tgt)) - np.repeat(np.cumsum(reps) - reps, reps)
+                particle = first + within
+                d = self.pos[particle] - targets[pair_tgt]
+                r_sq = np.einsum("ij,ij->i", d, d)
+                ok = r_sq > 0
+                inv_dist = (r_sq[ok] + eps_sq) ** -0.5
+                g_over_r = G * self.mass[particle[ok]] * inv_dist
+                w = g_over_r * inv_dist**2
+                if potential is not None:
+                    potential -= np.bincount(pair_tgt[ok], weights=g_over_r, minlength=m)
+                ax += np.bincount(pair_tgt[ok], weights=w * d[ok, 0], minlength=m)
+                ay += np.bincount(pair_tgt[ok], weights=w * d[ok, 1], minlength=m)
+
+            opened = ~is_leaf & ~far
+            open_tgt, open_node = tgt[opened], node[opened]
+            reps = self.child_count[open_node]
+            tgt = np.repeat(open_tgt, reps)
+            node = np.repeat(self.child_start[open_node], reps) + (
+                np.arange(len(tgt)) - np.repeat(np.cumsum(reps) - reps, reps))
+        return np.column_stack((ax, ay))
+
+
+if __name__ == "__main__":
+    # Self-check: tree accelerations for a light belt around a sun must track direct summation.
+    from nbody import compute_accelerations, pairwise_accelerations
+
+    rng = np.random.default_rng(1)
+    n = 3000
+    radius = rng.uniform(2.1, 3.3, n) * 149.6e9
+    angle = rng.uniform(0, 2 * np.pi, n)
+    pos = np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+    mass = rng.uniform(1e15, 1e19, n)
+
+    exact = compute_accelerations(pos, mass)
+    for theta in (0.3, 0.5, 0.8):
+        approx = QuadTree(pos, mass).accelerations(pos, theta)
+        # Belt self-gravity largely cancels, so measure against the typical acceleration magnitude.
+        scale = np.sqrt(np.mean(np.sum(exact**2, axis=1)))
+        err = np.linalg.norm(approx - exact, axis=1) / scale
+        print(f"theta={theta}: median rel err {np.median(err):.2e}, p99 {np.percentile(err, 99):.2e}")
+        assert np.percentile(err, 99) < 0.02 * theta
+
+    # The solver switch must agree with direct summation once the sun dominates.
+    from nbody import BodyStore
+    for solver in ("direct", "barnes_hut"):
+        store = BodyStore(solver=solver)
+        store.add(0, 0, 0, 0, 1.98892e30, fixed=True)
+        for (x, y), mm in zip(pos, mass):
+            store.add(x, y, 0, 0, mm, massive=False)
+        store.update_accelerations()
+        if solver == "direct":
+            reference = store.acc[:store.n].copy()
+    err = np.linalg.norm(store.acc[1:store.n] - reference[1:], axis=1) / np.linalg.norm(reference[1:], axis=1)
+    print(f"store with sun: max rel err {err.max():.2e}")
+    assert err.max() < 1e-6
+    assert np.allclose(pairwise_accelerations(pos[:5], pos[:5], mass[:5]), compute_accelerations(pos[:5], mass[:5]))
+    print("ok")
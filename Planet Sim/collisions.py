@@ -0,0 +1,45 @@
+import numpy as np
+
+# --- SPATIAL HASH BROADPHASE ---
+# Cells are at least as wide as the largest possible contact distance, so any touching
+# pair shares a cell or sits in adjacent ones. Checking the own cell plus four of the
+# eight neighbours visits every unordered cell pair exactly once.
+HALF_NEIGHBOURHOOD = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+KEY_SHIFT = np.int64(1 << 31)
+
+
+def _cell_keys(cx, cy):
+    return cx * (2 * KEY_SHIFT) + (cy + KEY_SHIFT)
+
+
+def find_overlaps(pos, radius, candidates=None):
+    """(i, j) index arrays of body pairs whose spheres overlap, i < j in `candidates` order."""
+    if candidates is None:
+        candidates = np.arange(len(pos))
+    if len(candidates) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    pos, radius = pos[candidates], radius[candidates]
+    cell_size = 2 * radius.max() or 1.0
+    cells = np.floor(pos / cell_size).astype(np.int64)
+    keys = _cell_keys(cells[:, 0], cells[:, 1])
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    found_i, found_j = [], []
+    body = np.arange(len(pos))
+    for dx, dy in HALF_NEIGHBOURHOOD:
+        neighbour = _cell_keys(cells[:, 0] + dx, cells[:, 1] + dy)
+        lo = np.searchsorted(sorted_keys, neighbour, side="left")
+        hi = np.searchsorted(sorted_keys, neighbour, side="right")
+        counts = hi - lo
+        i = np.repeat(body, counts)
+        j = order[np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+        if (dx, dy) == (0, 0):
+            keep = j > i
+            i, j = i[keep], j[keep]
+        d = pos[j] - pos[i]
+        touching = np.einsum("ij,ij->i", d, d) < (radius[i] + radius[j]) ** 2
+        found_i.append(i[touching])
+        found_j.append(j[touching])
+    i, j = np.concatenate(found_i), np.concatenate(found_j)
+    return candidates[np.minimum(i, j)], candidates[np.maximum(i, j)]
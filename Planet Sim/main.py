@@ -1,7 +1,17 @@
 import pygame
-import math
+import argparse
+import copy
 import sys
-import collections
+import time
+
+from nbody import INTEGRATORS, BodyStore
+from orbits import OrbitHistory
+from physics_thread import PhysicsThread
+from profiler import FrameProfiler
+from viewport import screen_points
+from text_cache import TextCache
+from solar_system import AU, ASTEROID_BELT_AU, BASE_TIMESTEP, PLANET_DATA, SUN_MASS, SUN_RADIUS
+from trajectory import Trajectory, TrajectoryWriter
 
 # --- SETUP & INITIALIZATION ---
 pygame.init()
@@ -16,105 +26,136 @@ COLOR_SUN = (255, 204, 0)
 COLOR_TEXT = (255, 255, 255)
 COLOR_UI_BG = (40, 40, 40)
 COLOR_UI_BG_HOVER = (70, 70, 70)
+COLOR_REPLAY_BAR = (0, 153, 255)
 
 # Use a standard system font like Consolas. Pygame handles fallbacks.
 FONT = pygame.font.SysFont("Consolas", 18)
 FONT_UI = pygame.font.SysFont("Consolas", 16)
 FONT_FPS = pygame.font.SysFont("Consolas", 20)
 
+# Labels, buttons and HUD lines rarely change between frames, so rendered surfaces are reused.
+TEXT_CACHE = TextCache(maxsize=256)
+DISTANCE_LABEL_STEP_AU = 0.05  # Distance labels snap to this step so they repeat and hit the cache
+
 # --- SIMULATION CONSTANTS ---
-G = 6.67428e-11
-AU = 149.6e6 * 1000
-BASE_TIMESTEP = 3600 * 24
 INITIAL_SCALE = 60 / AU
 FOCUS_SCALE = INITIAL_SCALE * 30
 LERP_FACTOR = 0.05
 
-# --- PLANET DATA ---
-PLANET_DATA = [
-    {"name": "Mercury", "color": (255, 204, 153), "mass": 0.33e24, "radius": 2439, "dist_au": 0.4, "y_vel": 47.4},
-    {"name": "Venus", "color": (255, 153, 153), "mass": 4.87e24, "radius": 6051, "dist_au": 0.7, "y_vel": 35.0},
-    {"name": "Earth", "color": (0, 102, 255), "mass": 5.97e24, "radius": 6371, "dist_au": 1.0, "y_vel": 29.8},
-    {"name": "Mars", "color": (255, 102, 0), "mass": 0.642e24, "radius": 3389, "dist_au": 1.5, "y_vel": 24.0},
-    {"name": "Jupiter", "color": (204, 153, 0), "mass": 1898e24, "radius": 69911, "dist_au": 5.2, "y_vel": 13.1},
-    {"name": "Saturn", "color": (255, 255, 204), "mass": 568e24, "radius": 58232, "dist_au": 9.5, "y_vel": 9.7},
-    {"name": "Uranus", "color": (0, 153, 255), "mass": 86.8e24, "radius": 25362, "dist_au": 19.8, "y_vel": 6.8},
-    {"name": "Neptune", "color": (102, 153, 255), "mass": 102e24, "radius": 24622, "dist_au": 30.0, "y_vel": 5.4},
-]
+# --- PHYSICS STEPPING ---
+# Each frame owes BASE_TIMESTEP * time_multiplier of simulated time, paid off in fixed
+# PHYSICS_DT sub-steps. Speeding up time means more sub-steps, never a bigger step.
+PHYSICS_DT = BASE_TIMESTEP / 4
+PHYSICS_BUDGET = 0.008  # Seconds of physics per frame before the backlog is dropped
+INTEGRATOR = "verlet"  # "verlet" or "yoshida4"
+TARGET_FPS = 150
+THREADED_PHYSICS = False  # Integrate in a background thread; the render loop draws its latest snapshot
+DIAGNOSTICS_EVERY = 0  # Sample energy / momentum every N physics steps (0 = off)
+
+# --- SOLVER SETTINGS ---
+SOLVER = "direct"  # "direct" or "barnes_hut" for large light-body populations
+THETA = 0.5  # Barnes-Hut opening angle: smaller is more accurate, larger is faster
+ASTEROID_COUNT = 0  # Light bodies scattered through the main belt
+SOFTENING = 0.0  # Metres added in quadrature to every distance; tames close encounters
+COLLISIONS = False  # Merge touching bodies (momentum-conserving) instead of letting them pass through
+COLOR_ASTEROID = (140, 140, 140)
+
+# --- ORBIT HISTORY ---
+TRAIL_LENGTH = 400
+FULL_ORBIT_POINTS = 2000  # Older history is decimated once this fills
+FULL_ORBIT_SAMPLE_EVERY = 15
 
 # --- HELPER FUNCTION ---
 def dim_color(color, factor=0.4):
     return tuple(max(0, int(c * factor)) for c in color)
 
 class Planet:
-    def __init__(self, x, y, radius, color, mass, name, y_vel=0):
-        self.x = x
-        self.y = y
-        self.radius_real = radius * 1000
+    def __init__(self, store, x, y, radius, color, mass, name, y_vel=0, is_sun=False):
+        self.store = store
+        self.index = store.add(x, y, 0, y_vel, mass, fixed=is_sun, radius=radius * 1000)
         self.color = color
         self.dimmed_color = dim_color(color)
         self.mass = mass
         self.name = name
 
-        self.orbit_trail = collections.deque(maxlen=400)
-        self.full_orbit = []
-
-        self.is_sun = False
-        self.distance_to_sun = 0
-
-        self.x_vel = 0
-        self.y_vel = y_vel
-        self.ax = self.ay = 0
+        self.orbit_trail = OrbitHistory(TRAIL_LENGTH, window=True)
+        self.full_orbit = OrbitHistory(FULL_ORBIT_POINTS, sample_every=FULL_ORBIT_SAMPLE_EVERY)
+
+        self.is_sun = is_sun
+        if is_sun:
+            store.sun_index = self.index
+
+    # Body state lives in the shared BodyStore; these are views onto this planet's row.
+    @property
+    def x(self): return self.store.pos[self.index, 0]
+    @property
+    def y(self): return self.store.pos[self.index, 1]
+    @property
+    def x_vel(self): return self.store.vel[self.index, 0]
+    @property
+    def y_vel(self): return self.store.vel[self.index, 1]
+    @property
+    def distance_to_sun(self): return self.store.distance_to_sun[self.index]
+    @property
+    def radius_real(self): return self.store.radius[self.index]
+    @property
+    def alive(self): return self.store.alive[self.index]
 
     def draw(self, win, scale, camera_x, camera_y, show_info):
+        if not self.alive: return
         screen_x = (self.x - camera_x) * scale + WIDTH / 2
         screen_y = (self.y - camera_y) * scale + HEIGHT / 2
         planet_radius_scaled = max(self.radius_real * scale, 2)
 
-        if len(self.full_orbit) > 2:
-            orbit_points = [
-                ((p[0] - camera_x) * scale + WIDTH / 2, (p[1] - camera_y) * scale + HEIGHT / 2)
-                for p in self.full_orbit
-            ]
-            pygame.draw.lines(win, self.dimmed_color, False, orbit_points, 1)
+        # Orbits whose stored extent misses the camera rectangle are never projected.
+        center = (WIDTH / 2, HEIGHT / 2)
+        view = view_rect(scale, camera_x, camera_y)
+        for orbit, color, width in ((self.full_orbit, self.dimmed_color, 1), (self.orbit_trail, self.color, 2)):
+            if len(orbit) > 2 and orbit.intersects(*view):
+                for run in orbit.screen_runs(scale, camera_x, camera_y, center, WIDTH, HEIGHT):
+                    pygame.draw.lines(win, color, False, run, width)
+
+        label_margin = 200
+        if (screen_x + planet_radius_scaled + label_margin < 0 or screen_x - planet_radius_scaled - label_margin > WIDTH or
+                screen_y + planet_radius_scaled + label_margin < 0 or screen_y - planet_radius_scaled - label_margin > HEIGHT):
+            return
 
-        if len(self.orbit_trail) > 2:
-            trail_points = [
-                ((p[0] - camera_x) * scale + WIDTH / 2, (p[1] - camera_y) * scale + HEIGHT / 2)
-                for p in self.orbit_trail
-            ]
-            pygame.draw.lines(win, self.color, False, trail_points, 2)
-        
         pygame.draw.circle(win, self.color, (screen_x, screen_y), planet_radius_scaled)
 
         if not self.is_sun and show_info:
-            name_text = FONT.render(self.name, 1, COLOR_TEXT)
-            dist_text = FONT.render(f"{self.distance_to_sun / AU:.2f} AU", 1, COLOR_TEXT)
+            name_text = TEXT_CACHE.render(FONT, self.name, COLOR_TEXT)
+            dist_au = round(self.distance_to_sun / AU / DISTANCE_LABEL_STEP_AU) * DISTANCE_LABEL_STEP_AU
+            dist_text = TEXT_CACHE.render(FONT, f"{dist_au:.2f} AU", COLOR_TEXT)
             name_pos_y = screen_y - planet_radius_scaled - name_text.get_height() - 5
             dist_pos_y = screen_y + planet_radius_scaled + 5
             win.blit(name_text, (screen_x - name_text.get_width() / 2, name_pos_y))
             win.blit(dist_text, (screen_x - dist_text.get_width() / 2, dist_pos_y))
 
-    def calculate_forces(self, planets):
-        total_fx = total_fy = 0
-        for other in planets:
-            if self == other: continue
-            dx, dy = other.x - self.x, other.y - self.y
-            dist = math.sqrt(dx**2 + dy**2)
-            if other.is_sun: self.distance_to_sun = dist
-            force = G * self.mass * other.mass / dist**2
-            theta = math.atan2(dy, dx)
-            total_fx += math.cos(theta) * force
-            total_fy += math.sin(theta) * force
-        self.ax, self.ay = total_fx / self.mass, total_fy / self.mass
-
-    def update_position_verlet(self, timestep, frame_count):
-        self.x += self.x_vel * timestep + 0.5 * self.ax * timestep**2
-        self.y += self.y_vel * timestep + 0.5 * self.ay * timestep**2
-        self.orbit_trail.append((self.x, self.y))
-        
-        if frame_count % 15 == 0:
-            self.full_orbit.append((self.x, self.y))
+    def clear_orbit(self):
+        self.orbit_trail.clear()
+        self.full_orbit.clear()
+
+    def record_orbit(self):
+        self.orbit_trail.append(self.x, self.y)
+        self.full_orbit.append(self.x, self.y)
+
+def view_rect(scale, camera_x, camera_y):
+    half_w, half_h = WIDTH / 2 / scale, HEIGHT / 2 / scale
+    return camera_x - half_w, camera_y - half_h, camera_x + half_w, camera_y + half_h
+
+def draw_asteroids(win, store, asteroids, scale, camera_x, camera_y):
+    # Off-screen bodies are masked out in one vectorized pass; being sub-pixel, the rest are
+    # written in one batched pixel-array assignment instead of per-body draws.
+    pos = store.pos[asteroids.start:asteroids.stop]
+    alive = store.alive[asteroids.start:asteroids.stop]
+    if not alive.all():
+        pos = pos[alive]
+    screen_x, screen_y = screen_points(pos, scale, camera_x, camera_y, *win.get_size())
+    if not len(screen_x):
+        return
+    pixels = pygame.surfarray.pixels2d(win)
+    pixels[screen_x, screen_y] = win.map_rgb(COLOR_ASTEROID)
+    del pixels  # Releases the surface lock before anything else is blitted
 
 class UI:
     def __init__(self, planets):
@@ -133,7 +174,7 @@ class UI:
         for button in self.buttons:
             bg_color = COLOR_UI_BG_HOVER if button["rect"].collidepoint(mouse_pos) else COLOR_UI_BG
             pygame.draw.rect(win, bg_color, button["rect"], border_radius=5)
-            text_surf = FONT_UI.render(button["text"], 1, COLOR_TEXT)
+            text_surf = TEXT_CACHE.render(FONT_UI, button["text"], COLOR_TEXT)
             text_rect = text_surf.get_rect(center=button["rect"].center)
             win.blit(text_surf, text_rect)
 
@@ -143,7 +184,39 @@ class UI:
                 return button["planet"]
         return None
 
-def main():
+class ReplayBar:
+    """Scrub bar along the bottom of the screen; clicking it seeks the replay."""
+    def __init__(self, replay):
+        self.replay = replay
+        self.rect = pygame.Rect(10, HEIGHT - 60, WIDTH - 20, 12)
+
+    def draw(self, win, replay_time, paused):
+        pygame.draw.rect(win, COLOR_UI_BG, self.rect, border_radius=5)
+        done = self.rect.copy()
+        done.width = int(self.rect.width * replay_time / max(self.replay.duration, 1))
+        pygame.draw.rect(win, COLOR_REPLAY_BAR, done, border_radius=5)
+        label = f"Replay: day {replay_time / BASE_TIMESTEP:.0f} / {self.replay.duration / BASE_TIMESTEP:.0f}"
+        label += " (paused)" if paused else ""
+        text_surf = TEXT_CACHE.render(FONT_UI, label, COLOR_TEXT)
+        win.blit(text_surf, (self.rect.x, self.rect.y - text_surf.get_height() - 4))
+
+    def handle_click(self, pos):
+        if not self.rect.collidepoint(pos):
+            return None
+        return (pos[0] - self.rect.x) / self.rect.width * self.replay.duration
+
+def draw_profiler(win, profiler):
+    lines = [f"{'phase':<9}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+    for phase, (p50, p95, p99) in profiler.summary().items():
+        lines.append(f"{phase:<9}{p50:>8.2f}{p95:>8.2f}{p99:>8.2f}")
+    y = HEIGHT - 80 - len(lines) * (FONT_UI.get_height() + 2)
+    for line in lines:
+        text_surf = TEXT_CACHE.render(FONT_UI, line, COLOR_TEXT)
+        win.blit(text_surf, (10, y))
+        y += text_surf.get_height() + 2
+
+def main(replay_path=None, record_path=None, profile_log=None, threaded=THREADED_PHYSICS,
+         diagnostics_every=DIAGNOSTICS_EVERY, diagnostics_path=None):
     run = True
     clock = pygame.time.Clock()
     frame_count = 0
@@ -155,101 +228,194 @@ def main():
     camera_target = None
     CAMERA_SPEED = 20
 
-    sun = Planet(0, 0, 696340, COLOR_SUN, 1.98892 * 10**30, "Sun")
-    sun.is_sun = True
+    store = BodyStore(solver=SOLVER, theta=THETA, integrator=INTEGRATOR, softening=SOFTENING, collisions=COLLISIONS)
+    sim_time_owed = 0.0
+    substeps = 0
+    sun = Planet(store, 0, 0, SUN_RADIUS, COLOR_SUN, SUN_MASS, "Sun", is_sun=True)
     planets = [sun]
     for data in PLANET_DATA:
-        planets.append(Planet(x=-data["dist_au"] * AU, y=0, radius=data["radius"], color=data["color"],
+        planets.append(Planet(store, x=-data["dist_au"] * AU, y=0, radius=data["radius"], color=data["color"],
                               mass=data["mass"], name=data["name"], y_vel=data["y_vel"] * 1000))
 
-    ui = UI(planets)
-
-    for planet in planets:
-        if planet.is_sun: continue
-        planet.calculate_forces(planets)
+    # A replay supplies every body position itself; anything past the planets is drawn as a belt body.
+    replay = Trajectory(replay_path) if replay_path else None
+    asteroid_count = replay.n_bodies - store.n if replay else ASTEROID_COUNT
+    asteroids = store.add_ring(asteroid_count, sun.index, ASTEROID_BELT_AU[0] * AU, ASTEROID_BELT_AU[1] * AU)
 
-    while run:
-        clock.tick(150)
-        timestep = BASE_TIMESTEP * time_multiplier
-        frame_count += 1
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: run = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    clicked_planet = ui.handle_click(event.pos)
-                    if clicked_planet: camera_target = clicked_planet
-            if event.type == pygame.KEYDOWN:
-                user_interrupted = True
-                if event.key == pygame.K_ESCAPE: run = False
-                elif event.key == pygame.K_KP_PLUS or event.key == pygame.K_EQUALS: scale *= 1.5
-                elif event.key == pygame.K_KP_MINUS or event.key == pygame.K_MINUS: scale /= 1.5
-                elif event.key == pygame.K_UP: time_multiplier *= 1.5
-                elif event.key == pygame.K_DOWN: time_multiplier = max(0.1, time_multiplier / 1.5)
-                elif event.key == pygame.K_i: show_info = not show_info
-                elif event.key == pygame.K_r: camera_x, camera_y, scale = 0, 0, INITIAL_SCALE
-                else: user_interrupted = False
-                if user_interrupted: camera_target = None
-
-        keys = pygame.key.get_pressed()
-        camera_move_amount = CAMERA_SPEED / scale
-        user_moved = False
-        if keys[pygame.K_w]: camera_y -= camera_move_amount; user_moved = True
-        if keys[pygame.K_s]: camera_y += camera_move_amount; user_moved = True
-        if keys[pygame.K_a]: camera_x -= camera_move_amount; user_moved = True
-        if keys[pygame.K_d]: camera_x += camera_move_amount; user_moved = True
-        if user_moved: camera_target = None
-
-        if camera_target:
-            target_x, target_y = camera_target.x, camera_target.y
-            target_scale = FOCUS_SCALE
-            camera_x += (target_x - camera_x) * LERP_FACTOR
-            camera_y += (target_y - camera_y) * LERP_FACTOR
-            scale += (target_scale - scale) * LERP_FACTOR
-            if abs(camera_x - target_x) < 1e6 and abs(scale - target_scale) < 1e-12:
-                camera_target = None
-
-        old_accelerations = {}
-        for planet in planets:
-            if planet.is_sun: continue
-            old_accelerations[planet.name] = (planet.ax, planet.ay)
-            planet.update_position_verlet(timestep, frame_count)
+    ui = UI(planets)
+    replay_bar = ReplayBar(replay) if replay else None
+    replay_time = 0.0
+    paused = False
+
+    store.update_accelerations()
+    if diagnostics_every and not replay:
+        store.enable_diagnostics(diagnostics_every)
+    recorder = TrajectoryWriter(record_path, store, PHYSICS_DT) if record_path else None
+    if recorder: recorder.append(store)
+
+    # Threaded mode: the worker integrates its own copy; `store` becomes a display mirror.
+    physics_thread = None
+    last_steps = 0
+    if threaded and not replay:
+        physics_thread = PhysicsThread(copy.deepcopy(store), PHYSICS_DT, BASE_TIMESTEP * time_multiplier * TARGET_FPS,
+                                       on_step=recorder.append if recorder else None)
+        physics_thread.start()
+    diagnostics = (physics_thread.store if physics_thread else store).diagnostics
+
+    profiler = FrameProfiler(log_path=profile_log)
+    show_profiler = False
+    store.profiler = profiler
+
+    try:
+        while run:
+            clock.tick(TARGET_FPS)
+            frame_count += 1
+            profiler.mark()
         
-        for planet in planets:
-            if planet.is_sun: continue
-            planet.calculate_forces(planets)
-
-        for planet in planets:
-            if planet.is_sun: continue
-            old_ax, old_ay = old_accelerations[planet.name]
-            planet.x_vel += 0.5 * (old_ax + planet.ax) * timestep
-            planet.y_vel += 0.5 * (old_ay + planet.ay) * timestep
-
-        WIN.fill(COLOR_BACKGROUND)
-        for planet in planets:
-            planet.draw(WIN, scale, camera_x, camera_y, show_info)
-        ui.draw(WIN)
-
-        info_text_y = 10
-        controls_text = [
-            f"Zoom: {scale/INITIAL_SCALE:.1f}x  | +/- to change",
-            f"Time: {time_multiplier:.1f}x | UP/DOWN to change",
-            f"Info: {'ON' if show_info else 'OFF'} | Press 'I' to toggle",
-            f"Move: WASD | Reset: R | Focus: Click list"
-        ]
-        for line in controls_text:
-            text_surf = FONT.render(line, 1, COLOR_TEXT)
-            WIN.blit(text_surf, (10, info_text_y))
-            info_text_y += text_surf.get_height() + 4
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: run = False
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.button == 1 and replay_bar and replay_bar.handle_click(event.pos) is not None:
+                        replay_time = replay_bar.handle_click(event.pos)
+                        for planet in planets: planet.clear_orbit()
+                    elif event.button == 1:
+                        clicked_planet = ui.handle_click(event.pos)
+                        if clicked_planet: camera_target = clicked_planet
+                if event.type == pygame.KEYDOWN:
+                    user_interrupted = True
+                    if event.key == pygame.K_ESCAPE: run = False
+                    elif event.key == pygame.K_KP_PLUS or event.key == pygame.K_EQUALS: scale *= 1.5
+                    elif event.key == pygame.K_KP_MINUS or event.key == pygame.K_MINUS: scale /= 1.5
+                    elif event.key == pygame.K_UP: time_multiplier *= 1.5
+                    elif event.key == pygame.K_DOWN: time_multiplier = max(0.1, time_multiplier / 1.5)
+                    elif event.key == pygame.K_i: show_info = not show_info
+                    elif event.key == pygame.K_p:
+                        show_profiler = not show_profiler
+                        user_interrupted = False
+                    elif replay and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                        step = replay.duration / 20 * (1 if event.key == pygame.K_RIGHT else -1)
+                        replay_time = min(max(replay_time + step, 0.0), replay.duration)
+                        for planet in planets: planet.clear_orbit()
+                        user_interrupted = False
+                    elif replay and event.key == pygame.K_SPACE:
+                        paused = not paused
+                        user_interrupted = False
+                    elif event.key == pygame.K_y:
+                        store.integrator = INTEGRATORS[(INTEGRATORS.index(store.integrator) + 1) % len(INTEGRATORS)]
+                        if physics_thread: physics_thread.store.integrator = store.integrator
+                        user_interrupted = False
+                    elif event.key == pygame.K_r: camera_x, camera_y, scale = 0, 0, INITIAL_SCALE
+                    else: user_interrupted = False
+                    if user_interrupted: camera_target = None
+
+            keys = pygame.key.get_pressed()
+            camera_move_amount = CAMERA_SPEED / scale
+            user_moved = False
+            if keys[pygame.K_w]: camera_y -= camera_move_amount; user_moved = True
+            if keys[pygame.K_s]: camera_y += camera_move_amount; user_moved = True
+            if keys[pygame.K_a]: camera_x -= camera_move_amount; user_moved = True
+            if keys[pygame.K_d]: camera_x += camera_move_amount; user_moved = True
+            if user_moved: camera_target = None
+
+            if camera_target:
+                target_x, target_y = camera_target.x, camera_target.y
+                target_scale = FOCUS_SCALE
+                camera_x += (target_x - camera_x) * LERP_FACTOR
+                camera_y += (target_y - camera_y) * LERP_FACTOR
+                scale += (target_scale - scale) * LERP_FACTOR
+                if abs(camera_x - target_x) < 1e6 and abs(scale - target_scale) < 1e-12:
+                    camera_target = None
+
+            profiler.mark("events")
+            substeps = 0
+            if replay:
+                # Replay: no integration, just read the recorded state at the playback time.
+                if not paused:
+                    replay_time = min(replay_time + BASE_TIMESTEP * time_multiplier, replay.duration)
+                pos, vel = replay.state_at(replay_time)
+                store.pos[:store.n] = pos
+                store.vel[:store.n] = vel
+                store.alive[:store.n] = replay.alive_at(replay_time)
+                store.update_distance_to_sun()
+                profiler.mark("position")
+            elif physics_thread:
+                physics_thread.rate = BASE_TIMESTEP * time_multiplier * TARGET_FPS
+                with physics_thread.snapshot() as snapshot:
+                    snapshot.copy_into(store)
+                    substeps, last_steps = snapshot.steps - last_steps, snapshot.steps
+                profiler.mark("position")
+            else:
+                sim_time_owed += BASE_TIMESTEP * time_multiplier
+            physics_start = time.perf_counter()
+            while sim_time_owed >= PHYSICS_DT:
+                store.step(PHYSICS_DT)
+                if recorder: recorder.append(store)
+                sim_time_owed -= PHYSICS_DT
+                substeps += 1
+                if time.perf_counter() - physics_start > PHYSICS_BUDGET:
+                    # Out of budget: drop the backlog so the sim slows down instead of the frame rate.
+                    sim_time_owed = 0.0
+                    break
+            profiler.mark()  # Physics phases were charged by the store itself
+            for planet in planets:
+                if planet.is_sun or not planet.alive: continue
+                planet.record_orbit()
+            profiler.mark("orbits")
+
+            label_seconds = TEXT_CACHE.seconds
+            WIN.fill(COLOR_BACKGROUND)
+            draw_asteroids(WIN, store, asteroids, scale, camera_x, camera_y)
+            for planet in planets:
+                planet.draw(WIN, scale, camera_x, camera_y, show_info)
+            ui.draw(WIN)
+            if replay_bar: replay_bar.draw(WIN, replay_time, paused)
+            profiler.mark("drawing")
+            profiler.transfer("drawing", "text", TEXT_CACHE.seconds - label_seconds)
+
+            info_text_y = 10
+            controls_text = [
+                f"Zoom: {scale/INITIAL_SCALE:.1f}x  | +/- to change",
+                f"Time: {time_multiplier:.1f}x ({substeps} steps/frame) | UP/DOWN to change",
+                f"Integrator: {store.integrator} | Press 'Y' to switch",
+                f"Info: {'ON' if show_info else 'OFF'} | Press 'I' to toggle | Profiler: 'P'",
+                f"Move: WASD | Reset: R | Focus: Click list"
+            ]
+            if replay:
+                controls_text.append("Replay: LEFT/RIGHT to seek | SPACE to pause | Click bar to scrub")
+            if diagnostics:
+                controls_text.append(f"Energy drift: {diagnostics.drift('energy'):.1e} | "
+                                     f"L drift: {diagnostics.drift('angular_momentum'):.1e}")
+            for line in controls_text:
+                text_surf = TEXT_CACHE.render(FONT, line, COLOR_TEXT)
+                WIN.blit(text_surf, (10, info_text_y))
+                info_text_y += text_surf.get_height() + 4
             
-        # --- FPS COUNTER DRAWING ---
-        fps_text = FONT_FPS.render(f"FPS: {int(clock.get_fps())}", 1, COLOR_TEXT)
-        WIN.blit(fps_text, (WIDTH - fps_text.get_width() - 10, HEIGHT - fps_text.get_height() - 10))
-
-        pygame.display.update()
-
-    pygame.quit()
+            # --- FPS COUNTER DRAWING ---
+            fps_text = TEXT_CACHE.render(FONT_FPS, f"FPS: {int(clock.get_fps())}", COLOR_TEXT)
+            WIN.blit(fps_text, (WIDTH - fps_text.get_width() - 10, HEIGHT - fps_text.get_height() - 10))
+            if show_profiler: draw_profiler(WIN, profiler)
+            profiler.mark("text")
+
+            pygame.display.update()
+            profiler.mark("display")
+            profiler.end_frame()
+    finally:
+        if physics_thread: physics_thread.stop()
+        if diagnostics and diagnostics_path: diagnostics.save(diagnostics_path)
+        if recorder: recorder.close()
+        profiler.close()
+        pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Interactive planet simulation.")
+    parser.add_argument("--replay", metavar="PATH", help="Play back a recorded trajectory instead of integrating")
+    parser.add_argument("--record", metavar="PATH", help="Record every physics step to a trajectory file")
+    parser.add_argument("--profile-log", metavar="PATH", help="Log per-frame phase timings (.csv, or .json for JSON lines)")
+    parser.add_argument("--threaded", action="store_true", default=THREADED_PHYSICS,
+                        help="Run physics in a background thread, decoupled from the frame rate")
+    parser.add_argument("--diagnostics-every", type=int, default=DIAGNOSTICS_EVERY,
+                        help="Sample energy / momentum every N physics steps")
+    parser.add_argument("--diagnostics", metavar="PATH", help="Save the diagnostics series on exit (.csv or .npy)")
+    args = parser.parse_args()
+    main(args.replay, args.record, args.profile_log, args.threaded, args.diagnostics_every, args.diagnostics)
\ No newline at end of file
@@ -0,0 +1,315 @@
+import time
+
+import numpy as np
+
+# --- PHYSICS CONSTANTS ---
+G = 6.67428e-11
+BELT_DENSITY = 2000  # kg/m^3, used to give belt bodies a collision radius
+
+SOLVERS = ("direct", "barnes_hut")
+INTEGRATORS = ("verlet", "yoshida4")
+
+# Yoshida (1990) 4th-order composition: three Verlet sub-steps with these weights.
+YOSHIDA_W1 = 1 / (2 - 2 ** (1 / 3))
+YOSHIDA_W0 = -(2 ** (1 / 3)) * YOSHIDA_W1
+
+
+# --- KERNELS ---
+def pairwise_accelerations(targets, sources, source_mass, softening=0.0, potential=None):
+    """Acceleration at every target from every source; zero-distance (self) pairs are skipped.
+
+    `softening` (metres) is added in quadrature to every distance so close encounters
+    stay bounded instead of blowing up as 1 / r^2. If a `potential` array is given, the
+    potential at each target is added to it from the same inverse distances.
+    """
+    delta = sources[np.newaxis, :, :] - targets[:, np.newaxis, :]  # delta[i, j] = source j - target i
+    dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+    self_pairs = dist_sq == 0
+    dist_sq += softening**2
+    dist_sq[self_pairs] = np.inf
+    if potential is None:
+        weights = G * source_mass[np.newaxis, :] * dist_sq ** -1.5
+    else:
+        inv_dist = dist_sq ** -0.5
+        g_over_r = G * source_mass[np.newaxis, :] * inv_dist
+        potential -= g_over_r.sum(axis=1)
+        weights = g_over_r * inv_dist**2
+    return np.einsum("ij,ijk->ik", weights, delta)
+
+
+def compute_accelerations(pos, mass, softening=0.0, potential=None):
+    """Direct all-pairs gravitational acceleration for every body, no Python loop."""
+    return pairwise_accelerations(pos, pos, mass, softening, potential)
+
+
+# --- DIAGNOSTICS ---
+def potential_energy(pos, mass, chunk=2048):
+    """Total pairwise gravitational potential energy, summed in row blocks to bound memory."""
+    total = 0.0
+    n = len(pos)
+    for lo in range(0, n, chunk):
+        rows = slice(lo, min(lo + chunk, n))
+        delta = pos[np.newaxis, :, :] - pos[rows, np.newaxis, :]
+        dist = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta))
+        upper = np.arange(n)[np.newaxis, :] > np.arange(lo, rows.stop)[:, np.newaxis]
+        pair_mass = mass[rows, np.newaxis] * mass[np.newaxis, :]
+        total -= G * np.sum(pair_mass[upper] / dist[upper])
+    return total
+
+
+class Diagnostics:
+    """Conserved-quantity time series sampled every `every` steps.
+
+    Potential energy comes from the per-body potentials the force pass already
+    produces on sampled steps, so a sample costs O(N) on top of the step.
+    """
+    COLUMNS = ("time", "kinetic", "potential", "energy", "momentum_x", "momentum_y", "angular_momentum")
+
+    def __init__(self, every=10):
+        self.every = every
+        self.steps = 0
+        self.time = 0.0
+        # Preallocated and doubled when full, so recording stays O(1) and drift() never copies
+        self.samples = np.zeros((64, len(self.COLUMNS)))
+        self.count = 0
+
+    def due(self):
+        return (self.steps + 1) % self.every == 0
+
+    def record(self, store):
+        n = store.n
+        mass, pos, vel = store.mass[:n], store.pos[:n], store.vel[:n]
+        kinetic = 0.5 * np.sum(mass * np.einsum("ij,ij->i", vel, vel))
+        potential = 0.5 * np.sum(mass * store.potential[:n])
+        momentum = (mass[:, np.newaxis] * vel).sum(axis=0)
+        angular = np.sum(mass * (pos[:, 0] * vel[:, 1] - pos[:, 1] * vel[:, 0]))
+        if self.count == len(self.samples):
+            grown = np.zeros((2 * len(self.samples), len(self.COLUMNS)))
+            grown[:self.count] = self.samples
+            self.samples = grown
+        self.samples[self.count] = self.time, kinetic, potential, kinetic + potential, momentum[0], momentum[1], angular
+        self.count += 1
+
+    def series(self):
+        return self.samples[:self.count]
+
+    def drift(self, column):
+        """Relative change of `column` between the first and the latest sample."""
+        # The renderer may call this while the physics thread records; take the buffer before
+        # the count so a concurrent grow can't leave the count past its end.
+        samples = self.samples
+        count = min(self.count, len(samples))
+        i = self.COLUMNS.index(column)
+        first, last = samples[0, i], samples[count - 1, i]
+        return abs((last - first) / first) if count > 1 and first else 0.0
+
+    def save(self, path):
+        """Write the series as .npy, or as CSV for any other extension."""
+        if path.endswith(".npy"):
+            np.save(path, self.series())
+        else:
+            np.savetxt(path, self.series(), delimiter=",", header=",".join(self.COLUMNS), comments="")
+
+
+class BodyStore:
+    """Struct-of-arrays body state: every body is one row in contiguous NumPy arrays."""
+
+    def __init__(self, capacity=16, solver="direct", theta=0.5, integrator="verlet", softening=0.0,
+                 collisions=False):
+        if solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator {integrator!r}, expected one of {INTEGRATORS}")
+        self.solver = solver
+        self.integrator = integrator
+        self.theta = theta
+        self.softening = softening
+        self.collisions = collisions
+        self.n = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.acc = np.zeros((capacity, 2))
+        self.mass = np.zeros(capacity)
+        self.fixed = np.zeros(capacity, dtype=bool)
+        self.massive = np.zeros(capacity, dtype=bool)
+        self.radius = np.zeros(capacity)
+        # Merged-away bodies keep their row (so indices stay valid) but lose their mass and
+        # are pinned like the sun, so they sit frozen where they were absorbed.
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.sun_index = None
+        self.distance_to_sun = np.zeros(capacity)
+        self.profiler = None  # Optional FrameProfiler that receives per-phase step timings
+        self.diagnostics = None
+        self.sample_potential = False  # Force passes also fill self.potential while set
+        self.potential = np.zeros(capacity)
+
+    def _grow(self):
+        capacity = max(1, len(self.mass)) * 2
+        for name in ("pos", "vel", "acc", "mass", "fixed", "massive", "radius", "alive", "distance_to_sun", "potential"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def add(self, x, y, x_vel, y_vel, mass, fixed=False, massive=True, radius=0.0):
+        if self.n == len(self.mass):
+            self._grow()
+        i = self.n
+        self.pos[i] = x, y
+        self.vel[i] = x_vel, y_vel
+        self.acc[i] = 0
+        self.mass[i] = mass
+        self.fixed[i] = fixed
+        self.massive[i] = massive
+        self.radius[i] = radius
+        self.alive[i] = True
+        self.n += 1
+        return i
+
+    def update_accelerations(self):
+        n = self.n
+        acc = self.acc[:n]
+        pos, mass = self.pos[:n], self.mass[:n]
+        potential = None
+        if self.sample_potential:
+            potential = self.potential[:n]
+            potential[:] = 0
+        if self.solver == "direct":
+            acc[:] = compute_accelerations(pos, mass, self.softening, potential)
+        else:
+            from barnes_hut import QuadTree  # barnes_hut imports G from here, so resolve it lazily
+
+            # Massive bodies are always summed exactly; only the light population goes through the tree.
+            massive = self.massive[:n]
+            acc[:] = pairwise_accelerations(pos, pos[massive], mass[massive], self.softening, potential)
+            light = ~massive & self.alive[:n]
+            if light.any():
+                acc += QuadTree(pos[light], mass[light]).accelerations(pos, self.theta, self.softening, potential)
+        acc[self.fixed[:n]] = 0
+        self.update_distance_to_sun()
+
+    def update_distance_to_sun(self):
+        if self.sun_index is not None:
+            offset = self.pos[:self.n] - self.pos[self.sun_index]
+            self.distance_to_sun[:self.n] = np.hypot(offset[:, 0], offset[:, 1])
+
+    def energy(self):
+        n = self.n
+        kinetic = 0.5 * np.sum(self.mass[:n] * np.einsum("ij,ij->i", self.vel[:n], self.vel[:n]))
+        return kinetic + potential_energy(self.pos[:n], self.mass[:n])
+
+    def angular_momentum(self):
+        """Total z angular momentum about the origin (where the fixed sun sits)."""
+        n = self.n
+        pos, vel = self.pos[:n], self.vel[:n]
+        return np.sum(self.mass[:n] * (pos[:, 0] * vel[:, 1] - pos[:, 1] * vel[:, 0]))
+
+    def add_ring(self, count, central_index, inner, outer, mass_range=(1e15, 1e19), seed=None):
+        """Scatter `count` light bodies on circular orbits around body `central_index`."""
+        rng = np.random.default_rng(seed)
+        radius = np.sqrt(rng.uniform(inner**2, outer**2, count))
+        angle = rng.uniform(0, 2 * np.pi, count)
+        speed = np.sqrt(G * self.mass[central_index] / radius)
+        cx, cy = self.pos[central_index]
+        cvx, cvy = self.vel[central_index]
+        first = self.n
+        for r, a, v, m in zip(radius, angle, speed, rng.uniform(*mass_range, count)):
+            self.add(cx + r * np.cos(a), cy + r * np.sin(a), cvx - v * np.sin(a), cvy + v * np.cos(a),
+                     m, massive=False, radius=(3 * m / (4 * np.pi * BELT_DENSITY)) ** (1 / 3))
+        return range(first, self.n)
+
+    def step_verlet(self, dt):
+        """Velocity-Verlet: drift with the old acceleration, re-evaluate, kick with the average."""
+        n = self.n
+        pos, vel, acc = self.pos[:n], self.vel[:n], self.acc[:n]
+        start = time.perf_counter()
+        old_acc = acc.copy()
+        pos += vel * dt + 0.5 * old_acc * dt**2
+        drifted = time.perf_counter()
+        self.update_accelerations()
+        forced = time.perf_counter()
+        vel += 0.5 * (old_acc + acc) * dt
+        if self.profiler:
+            self.profiler.add("position", drifted - start)
+            self.profiler.add("forces", forced - drifted)
+            self.profiler.add("velocity", time.perf_counter() - forced)
+
+    def step_yoshida4(self, dt):
+        """4th-order symplectic step built from three Verlet sub-steps (one has a negative weight)."""
+        self.step_verlet(YOSHIDA_W1 * dt)
+        self.step_verlet(YOSHIDA_W0 * dt)
+        self.step_verlet(YOSHIDA_W1 * dt)
+
+    def merge_collisions(self):
+        """Merge every group of touching bodies into its most massive member; returns the number absorbed.
+
+        Merges are perfectly inelastic: mass and momentum are conserved and the survivor
+        sits at the group's centre of mass with the combined volume. A fixed body (the
+        sun) swallows whatever hits it and stays put.
+        """
+        from collisions import find_overlaps
+
+        n = self.n
+        first, second = find_overlaps(self.pos[:n], self.radius[:n], np.flatnonzero(self.alive[:n]))
+        if not len(first):
+            return 0
+
+        # Union-find over the (rare) touching pairs so chains like A-B, B-C merge as one group.
+        parent = {}
+        def root(i):
+            while parent.get(i, i) != i:
+                i = parent[i]
+            return i
+        for i, j in zip(first.tolist(), second.tolist()):
+            ri, rj = root(i), root(j)
+            if ri != rj:
+                parent[rj] = ri
+        groups = {}
+        absorbed_count = 0
+        for i in set(first.tolist()) | set(second.tolist()):
+            groups.setdefault(root(i), []).append(i)
+
+        for members in groups.values():
+            members = np.array(members)
+            mass = self.mass[members]
+            fixed = members[self.fixed[members]]
+            survivor = fixed[0] if len(fixed) else members[np.argmax(mass)]
+            total = mass.sum()
+            if not len(fixed):
+                self.pos[survivor] = (self.pos[members] * mass[:, np.newaxis]).sum(axis=0) / total
+                self.vel[survivor] = (self.vel[members] * mass[:, np.newaxis]).sum(axis=0) / total
+            self.radius[survivor] = np.cbrt(np.sum(self.radius[members] ** 3))
+            self.massive[survivor] = self.massive[members].any()
+            self.mass[survivor] = total
+            absorbed = members[members != survivor]
+            self.mass[absorbed] = 0
+            self.vel[absorbed] = 0
+            self.fixed[absorbed] = True
+            self.alive[absorbed] = False
+            absorbed_count += len(absorbed)
+        return absorbed_count
+
+    def enable_diagnostics(self, every=10):
+        """Attach a Diagnostics series and take its t=0 sample."""
+        self.diagnostics = Diagnostics(every)
+        self.sample_potential = True
+        self.update_accelerations()
+        self.diagnostics.record(self)
+        self.sample_potential = False
+        return self.diagnostics
+
+    def step(self, dt):
+        diagnostics = self.diagnostics
+        self.sample_potential = bool(diagnostics and diagnostics.due())
+        if self.integrator == "yoshida4":
+            self.step_yoshida4(dt)
+        else:
+            self.step_verlet(dt)
+        if self.collisions and self.merge_collisions():
+            self.update_accelerations()
+        if diagnostics:
+            diagnostics.steps += 1
+            diagnostics.time += dt
+            if self.sample_potential:
+                diagnostics.record(self)
+                self.sample_potential = False
@@ -0,0 +1,110 @@
+import numpy as np
+
+from viewport import visible_runs
+
+# --- ORBIT HISTORY ---
+# Points live in a flat array twice the capacity so appends are O(1) and the live
+# slice is compacted to the front only once per `capacity` appends. Projected
+# screen points mirror the same slots and stay valid until the view changes.
+MIN_SEGMENT_PX = 2.0
+
+
+class OrbitHistory:
+    def __init__(self, capacity, sample_every=1, window=False):
+        """Bounded orbit history.
+
+        window=True keeps only the newest `capacity` points (a trail); otherwise
+        every time the buffer fills, every other point is dropped and the sampling
+        interval doubles, so the whole run stays covered at constant cost.
+        """
+        self.capacity = capacity
+        self.sample_every = sample_every
+        self.window = window
+        self._points = np.empty((2 * capacity, 2))
+        self._screen = np.empty((2 * capacity, 2))
+        self._start = self._end = 0
+        self._projected = 0
+        self._view = None
+        self._lod_step = 1
+        self._counter = 0
+        self._runs = None
+        self._runs_key = None
+        self.bounds = None  # (min_x, min_y, max_x, max_y) of everything ever stored, for culling
+
+    def __len__(self):
+        return self._end - self._start
+
+    def append(self, x, y):
+        self._counter += 1
+        if self._counter % self.sample_every:
+            return
+        if self._end == len(self._points):
+            self._compact()
+        self._points[self._end] = x, y
+        self._end += 1
+        if self.bounds is None:
+            self.bounds = (x, y, x, y)
+        else:
+            min_x, min_y, max_x, max_y = self.bounds
+            self.bounds = (min(min_x, x), min(min_y, y), max(max_x, x), max(max_y, y))
+        if len(self) > self.capacity:
+            if self.window:
+                self._start += 1
+            else:
+                self._decimate()
+
+    def clear(self):
+        self._start = self._end = self._projected = 0
+        self._view = None
+        self.bounds = None
+
+    def _compact(self):
+        n = len(self)
+        self._points[:n] = self._points[self._start:self._end]
+        self._screen[:n] = self._screen[self._start:self._end]
+        self._projected -= self._start
+        self._start, self._end = 0, n
+
+    def _decimate(self):
+        kept = self._points[self._start:self._end][::-2][::-1].copy()  # keep the newest point
+        self._points[:len(kept)] = kept
+        self._start, self._end = 0, len(kept)
+        self.sample_every *= 2
+        self._view = None
+
+    def screen_points(self, scale, camera_x, camera_y, center):
+        """Projected points for pygame.draw.lines, thinned so segments are >= MIN_SEGMENT_PX long."""
+        view = (scale, camera_x, camera_y, center)
+        if view != self._view:
+            self._view = view
+            self._projected = self._start
+            self._lod_step = 0
+        self._projected = max(self._projected, self._start)
+        if self._projected < self._end:
+            fresh = slice(self._projected, self._end)
+            self._screen[fresh] = (self._points[fresh] - (camera_x, camera_y)) * scale + center
+            self._projected = self._end
+
+        points = self._screen[self._start:self._end]
+        if not self._lod_step and len(points) > 2:
+            # Level of detail: pick a stride from the typical on-screen segment length at this zoom.
+            seg = np.hypot(*np.diff(points, axis=0).T)
+            self._lod_step = max(1, int(MIN_SEGMENT_PX / max(np.median(seg), 1e-9)))
+        step = max(1, self._lod_step)
+        if step > 1:
+            points = points[::-step][::-1]
+        return points
+
+    def intersects(self, x0, y0, x1, y1):
+        if self.bounds is None:
+            return False
+        min_x, min_y, max_x, max_y = self.bounds
+        return min_x <= x1 and max_x >= x0 and min_y <= y1 and max_y >= y0
+
+    def screen_runs(self, scale, camera_x, camera_y, center, width, height):
+        """Visible pieces of the projected polyline; recomputed only when points or view change."""
+        key = (self._start, self._end, self.sample_every, scale, camera_x, camera_y, center)
+        if key != self._runs_key:
+            self._runs_key = key
+            self._runs = visible_runs(self.screen_points(scale, camera_x, camera_y, center), width, height)
+        return self._runs
@@ -0,0 +1,115 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# --- BACKGROUND PHYSICS ---
+# The worker owns its own BodyStore and integrates at whatever rate it can sustain. It
+# publishes state through two snapshot buffers: it only ever writes the back buffer,
+# and swaps it to the front when the renderer is not holding the front one. Neither
+# side waits on the other beyond a pointer swap under a lock.
+
+
+class Snapshot:
+    def __init__(self, capacity):
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.distance_to_sun = np.zeros(capacity)
+        # Collision merges change a survivor's mass and size, so those are published too
+        self.mass = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.n = 0
+        self.sim_time = 0.0
+        self.steps = 0
+
+    def _set_writeable(self, flag):
+        for array in (self.pos, self.vel, self.alive, self.distance_to_sun, self.mass, self.radius):
+            array.flags.writeable = flag
+
+    def fill_from(self, store, sim_time, steps):
+        n = store.n
+        if n > len(self.alive):
+            self.__init__(n)
+        self._set_writeable(True)
+        self.pos[:n] = store.pos[:n]
+        self.vel[:n] = store.vel[:n]
+        self.alive[:n] = store.alive[:n]
+        self.distance_to_sun[:n] = store.distance_to_sun[:n]
+        self.mass[:n] = store.mass[:n]
+        self.radius[:n] = store.radius[:n]
+        self._set_writeable(False)  # Published snapshots are read-only for the renderer
+        self.n, self.sim_time, self.steps = n, sim_time, steps
+
+    def copy_into(self, store):
+        n = self.n
+        store.pos[:n] = self.pos[:n]
+        store.vel[:n] = self.vel[:n]
+        store.alive[:n] = self.alive[:n]
+        store.distance_to_sun[:n] = self.distance_to_sun[:n]
+        store.mass[:n] = self.mass[:n]
+        store.radius[:n] = self.radius[:n]
+
+
+class PhysicsThread(threading.Thread):
+    def __init__(self, store, dt, rate, budget=0.05, on_step=None):
+        """Integrate `store` in fixed `dt` steps, targeting `rate` simulated seconds per wall second."""
+        super().__init__(daemon=True, name="physics")
+        self.store = store
+        self.dt = dt
+        self.rate = rate
+        self.budget = budget
+        self.on_step = on_step
+        self.sim_time = 0.0
+        self.steps = 0
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._front = Snapshot(store.n)
+        self._back = Snapshot(store.n)
+        self._front.fill_from(store, 0.0, 0)
+        self._front_in_use = False
+
+    def run(self):
+        owed = 0.0
+        last = time.perf_counter()
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            owed += (now - last) * self.rate
+            last = now
+            if owed < self.dt:
+                time.sleep(min(0.002, (self.dt - owed) / max(self.rate, 1e-9)))
+                continue
+            while owed >= self.dt:
+                self.store.step(self.dt)
+                if self.on_step: self.on_step(self.store)
+                owed -= self.dt
+                self.sim_time += self.dt
+                self.steps += 1
+                if time.perf_counter() - now > self.budget:
+                    owed = 0.0  # Can't keep up: drop the backlog rather than spiral
+                    break
+            self._back.fill_from(self.store, self.sim_time, self.steps)
+            self._publish()
+
+    def _publish(self):
+        with self._lock:
+            if self._front_in_use:
+                return  # Renderer is reading the front; the next publish will swap instead
+            self._front, self._back = self._back, self._front
+
+    @contextmanager
+    def snapshot(self):
+        """Hold the latest published snapshot for the duration of the block."""
+        with self._lock:
+            self._front_in_use = True
+            front = self._front
+        try:
+            yield front
+        finally:
+            with self._lock:
+                self._front_in_use = False
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
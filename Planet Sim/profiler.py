@@ -0,0 +1,69 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+# --- FRAME PROFILER ---
+PHASES = ("events", "position", "forces", "velocity", "orbits", "drawing", "text", "display")
+
+
+class FrameProfiler:
+    """Per-phase frame timings with rolling percentiles and an optional CSV / JSON-lines log."""
+
+    def __init__(self, window=600, log_path=None, summary_every=30):
+        self.window = window
+        self.summary_every = summary_every
+        self.frames = 0
+        self._history = np.zeros((window, len(PHASES)))
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._last_mark = time.perf_counter()
+        self._summary = {}
+        self._log = None
+        self._writer = None
+        if log_path:
+            self._log = open(log_path, "w", newline="")
+            if not log_path.endswith(".json") and not log_path.endswith(".jsonl"):
+                self._writer = csv.writer(self._log)
+                self._writer.writerow(("frame",) + PHASES)
+
+    def add(self, phase, seconds):
+        self._current[phase] += seconds
+
+    def mark(self, phase=None):
+        """Charge the time since the previous mark to `phase` (None just restarts the stopwatch)."""
+        now = time.perf_counter()
+        if phase:
+            self._current[phase] += now - self._last_mark
+        self._last_mark = now
+
+    def transfer(self, source, target, seconds):
+        self._current[source] -= seconds
+        self._current[target] += seconds
+
+    def end_frame(self):
+        row = [self._current[p] * 1000 for p in PHASES]
+        self._history[self.frames % self.window] = row
+        self.frames += 1
+        if self._writer:
+            self._writer.writerow([self.frames] + [f"{ms:.4f}" for ms in row])
+        elif self._log:
+            self._log.write(json.dumps({"frame": self.frames, **dict(zip(PHASES, row))}) + "\n")
+        self._current = dict.fromkeys(PHASES, 0.0)
+        if self.frames % self.summary_every == 0:
+            self._summary = None
+
+    def summary(self):
+        """{phase: (p50, p95, p99)} in milliseconds over the rolling window, refreshed every few frames."""
+        if not self._summary and self.frames:
+            history = self._history[:min(self.frames, self.window)]
+            p50, p95, p99 = np.percentile(history, (50, 95, 99), axis=0)
+            self._summary = {phase: (p50[i], p95[i], p99[i]) for i, phase in enumerate(PHASES)}
+            totals = np.percentile(history.sum(axis=1), (50, 95, 99))
+            self._summary["total"] = tuple(totals)
+        return self._summary or {}
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = self._writer = None
@@ -0,0 +1,32 @@
+from nbody import BodyStore
+
+# --- SYSTEM CONSTANTS ---
+AU = 149.6e6 * 1000
+BASE_TIMESTEP = 3600 * 24
+SUN_MASS = 1.98892 * 10**30
+SUN_RADIUS = 696340
+ASTEROID_BELT_AU = (2.1, 3.3)
+
+# --- PLANET DATA ---
+PLANET_DATA = [
+    {"name": "Mercury", "color": (255, 204, 153), "mass": 0.33e24, "radius": 2439, "dist_au": 0.4, "y_vel": 47.4},
+    {"name": "Venus", "color": (255, 153, 153), "mass": 4.87e24, "radius": 6051, "dist_au": 0.7, "y_vel": 35.0},
+    {"name": "Earth", "color": (0, 102, 255), "mass": 5.97e24, "radius": 6371, "dist_au": 1.0, "y_vel": 29.8},
+    {"name": "Mars", "color": (255, 102, 0), "mass": 0.642e24, "radius": 3389, "dist_au": 1.5, "y_vel": 24.0},
+    {"name": "Jupiter", "color": (204, 153, 0), "mass": 1898e24, "radius": 69911, "dist_au": 5.2, "y_vel": 13.1},
+    {"name": "Saturn", "color": (255, 255, 204), "mass": 568e24, "radius": 58232, "dist_au": 9.5, "y_vel": 9.7},
+    {"name": "Uranus", "color": (0, 153, 255), "mass": 86.8e24, "radius": 25362, "dist_au": 19.8, "y_vel": 6.8},
+    {"name": "Neptune", "color": (102, 153, 255), "mass": 102e24, "radius": 24622, "dist_au": 30.0, "y_vel": 5.4},
+]
+
+
+def build_store(planet_data=PLANET_DATA, asteroid_count=0, solver="direct", theta=0.5, integrator="verlet",
+                seed=None, softening=0.0, collisions=False):
+    """The sun plus `planet_data` (and an optional belt) in a fresh BodyStore, without any display."""
+    store = BodyStore(solver=solver, theta=theta, integrator=integrator, softening=softening, collisions=collisions)
+    store.sun_index = store.add(0, 0, 0, 0, SUN_MASS, fixed=True, radius=SUN_RADIUS * 1000)
+    for data in planet_data:
+        store.add(-data["dist_au"] * AU, 0, 0, data["y_vel"] * 1000, data["mass"], radius=data["radius"] * 1000)
+    store.add_ring(asteroid_count, store.sun_index, ASTEROID_BELT_AU[0] * AU, ASTEROID_BELT_AU[1] * AU, seed=seed)
+    store.update_accelerations()
+    return store
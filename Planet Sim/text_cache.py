@@ -0,0 +1,38 @@
+import time
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.seconds = 0.0  # Total time spent in render(), for the frame profiler
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        start = time.perf_counter()
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            surface = font.render(text, antialias, color)
+            self._surfaces[key] = surface
+            if len(self._surfaces) > self.maxsize:
+                self._surfaces.popitem(last=False)
+        self.seconds += time.perf_counter() - start
+        return surface
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = self.misses = 0
+        self.seconds = 0.0
@@ -0,0 +1,101 @@
+import os
+import struct
+
+import numpy as np
+
+# --- FILE FORMAT ---
+# header:  magic b"PSTR", u16 version, u16 reserved, u32 body count, u32 frame count,
+#          f64 seconds between frames
+# masses:  f64[body count]
+# merged:  u32[body count], first frame at which each body has been merged away (NEVER if it survives)
+# frames:  f32[frame count, body count, 4] as (x, y, x_vel, y_vel)
+# The counts in the header are only patched on close; a file from an interrupted run is read
+# up to its last complete frame.
+# float32 keeps a century of daily frames for the full system to a few MB while
+# still resolving positions to well under a planet radius at 30 AU.
+MAGIC = b"PSTR"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIId")
+FRAME_DTYPE = np.float32
+NEVER = 0xFFFFFFFF
+
+
+class TrajectoryWriter:
+    """Streams BodyStore frames to disk; the frame count and merge frames are patched on close."""
+
+    def __init__(self, path, store, frame_dt):
+        self.n_bodies = store.n
+        self.frame_dt = frame_dt
+        self.n_frames = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.n_bodies, 0, frame_dt))
+        self._file.write(np.ascontiguousarray(store.mass[:store.n], dtype=np.float64).tobytes())
+        self.merged = np.full(self.n_bodies, NEVER, dtype=np.uint32)
+        self._file.write(self.merged.tobytes())
+        self._frame = np.empty((self.n_bodies, 4), dtype=FRAME_DTYPE)
+
+    def append(self, store):
+        self.merged[~store.alive[:self.n_bodies] & (self.merged == NEVER)] = self.n_frames
+        self._frame[:, :2] = store.pos[:self.n_bodies]
+        self._frame[:, 2:] = store.vel[:self.n_bodies]
+        self._file.write(self._frame.tobytes())
+        self.n_frames += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.n_bodies, self.n_frames, self.frame_dt))
+        self._file.seek(HEADER.size + 8 * self.n_bodies)
+        self._file.write(self.merged.tobytes())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Trajectory:
+    """Zero-copy, memory-mapped view of a recorded run; any frame is one slice away."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, _, self.n_bodies, self.n_frames, self.frame_dt = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{path} is not a version 1 or {VERSION} Planet Sim trajectory")
+        self.mass = np.memmap(path, dtype=np.float64, mode="r", offset=HEADER.size, shape=(self.n_bodies,))
+        offset = HEADER.size + 8 * self.n_bodies
+        if version == 1:
+            self.merged = np.full(self.n_bodies, NEVER, dtype=np.uint32)  # Recorded before merging existed
+        else:
+            self.merged = np.memmap(path, dtype=np.uint32, mode="r", offset=offset, shape=(self.n_bodies,))
+            offset += 4 * self.n_bodies
+        frame_size = self.n_bodies * 4 * np.dtype(FRAME_DTYPE).itemsize
+        complete = (os.path.getsize(path) - offset) // frame_size if frame_size else 0
+        if self.n_frames == 0 or self.n_frames > complete:
+            self.n_frames = complete
+        if self.n_frames == 0:
+            raise ValueError(f"{path} has no recorded frames")
+        self.frames = np.memmap(path, dtype=FRAME_DTYPE, mode="r", offset=offset,
+                                shape=(self.n_frames, self.n_bodies, 4))
+
+    @property
+    def duration(self):
+        return max(0, self.n_frames - 1) * self.frame_dt
+
+    def state_at(self, t):
+        """Positions and velocities at time t (seconds), linearly interpolated between frames."""
+        position = min(max(t / self.frame_dt, 0.0), self.n_frames - 1)
+        i = min(int(position), self.n_frames - 2) if self.n_frames > 1 else 0
+        frac = position - i
+        if frac == 0 or self.n_frames == 1:
+            state = np.asarray(self.frames[i], dtype=np.float64)
+        else:
+            state = (1 - frac) * self.frames[i] + frac * self.frames[i + 1]
+        return state[:, :2], state[:, 2:]
+
+    def alive_at(self, t):
+        """Which bodies have not yet been merged away at time t (seconds)."""
+        return self.merged > min(max(t / self.frame_dt, 0.0), self.n_frames - 1)
@@ -1,170 +1,86 @@
-import pygame
+import argparse
 import random
-import time
-import math
+
+import pygame
+
+from input_log import InputLogWriter
+from pong_core import (AI_DIFFICULTY, BALL_RADIUS, HEIGHT, LEFT, PADDLE_WIDTH, RIGHT, SCORE_PAUSE, TICK_RATE,
+                       WIDTH, PongBatch)
+from pong_render import REPAINT_EVENTS, DirtyRenderer
+
+# Command line: a seed makes the serves and AI error reproducible; --record logs every tick's
+# inputs so the game can be replayed headless with `python input_log.py <log>`.
+parser = argparse.ArgumentParser(description="Pong")
+parser.add_argument("--seed", type=int, default=None, help="Seed for serves and AI error (random if omitted)")
+parser.add_argument("--record", metavar="PATH", help="Write a binary log of per-tick inputs to PATH")
+args = parser.parse_args()
+seed = args.seed if args.seed is not None else random.randrange(2**63)
 
 # Initialize Pygame
 pygame.init()
 
 # --- Global Variables ---
 
-# Modifiable Screen Dimensions
-SCREEN_SCALE_FACTOR = 1 # Adjust this for overall scaling (0.5, 0.75, 1.0, etc.)
-BASE_WIDTH = 1920
-BASE_HEIGHT = 1080
-WIDTH = int(BASE_WIDTH * SCREEN_SCALE_FACTOR)
-HEIGHT = int(BASE_HEIGHT * SCREEN_SCALE_FACTOR)
-
-# Target FPS and timing
-FPS = 300  # Target frames per second
-dt = 1 / FPS  # Delta time (time per frame) used for calculations
+# Timing: the simulation runs at a fixed TICK_RATE, rendering at whatever rate the display allows
+FPS = 144  # Render frame cap (0 = uncapped, paced by vsync alone)
+VSYNC = True
+dt = 1 / TICK_RATE  # Fixed simulation step
+MAX_FRAME_TIME = 0.25  # Longest frame fed to the simulation, so a stall can't trigger a catch-up spiral
+FULL_REDRAW = False  # True repaints and flips the whole screen every frame instead of dirty rects
 
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-# --- Game Constants ---
-
-# Paddle constants
-PADDLE_WIDTH = WIDTH / 80  # Adjust divisor for paddle width relative to screen width
-INITIAL_PADDLE_HEIGHT = HEIGHT / 5 # Adjust divisor for initial paddle height relative to screen height
-PADDLE_HEIGHT_LIMIT = 0.25  # Minimum paddle height (25% of initial height)
-PADDLE_SPEED = HEIGHT * 1.66 * dt # Initial paddle speed. Adjust multiplier as needed
-PADDLE_SPEED_CAP = PADDLE_SPEED * 4  # Maximum paddle speed after ramp-up (4 times the initial speed)
-
-# Ball constants
-BALL_RADIUS = WIDTH / 120  # Adjust divisor for ball radius relative to screen width
-BALL_SPEED_X = WIDTH * 1 * dt  # Initial horizontal ball speed. Adjust multiplier as needed
-BALL_SPEED_Y = HEIGHT * 1 * dt # Initial vertical ball speed. Adjust multiplier as needed
-MAXBALLMULT = 3 # Maximum ball speed multiplier
-
-# Maximum deflection angle
-MAX_DEFLECTION = 0.66  # (Approximately 30 degrees)
-
 # Font setup for score display
 font = pygame.font.Font(None, int(WIDTH / 40))
 
-# --- Functions ---
-
-def calculate_speed(base_speed):
-    """Calculates speed based on delta time to maintain consistency across frame rates."""
-    return base_speed * dt
-
-# --- Classes ---
-
-class Paddle:
-    def __init__(self, x, is_ai=False):
-        self.width = PADDLE_WIDTH
-        self.height = INITIAL_PADDLE_HEIGHT
-        self.x = x
-        self.y = HEIGHT // 2 - self.height // 2
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        self.is_ai = is_ai
-        self.speed = PADDLE_SPEED
-
-    def move(self, dy):
-        # Apply speed cap
-        dy = max(-self.speed, min(dy, self.speed))
-        self.y += dy
-        # Keep paddle within screen bounds
-        self.y = max(0, min(self.y, HEIGHT - self.height))
-        self.rect.y = self.y
-
-    def ai_move(self, ball):
-        # More intelligent AI: Consider paddle height for better positioning
-        target_y = ball.y - self.height / 2
-        target_y += random.uniform(-self.height / 4, self.height / 4)
-
-        if abs(target_y - self.y) > self.speed:
-            if target_y < self.y:
-                self.move(-self.speed)
-            else:
-                self.move(self.speed)
-        else:
-            self.move(target_y - self.y)
-
-    def update_size(self):
-        # Limit paddle size reduction
-        self.height = max(self.height, INITIAL_PADDLE_HEIGHT * PADDLE_HEIGHT_LIMIT)
-        self.rect.height = self.height
-        # Keep the paddle centered when it shrinks
-        self.rect.y = self.y
-
-class Ball:
-    def __init__(self):
-        self.radius = BALL_RADIUS
-        self.num_hits = 0
-        self.reset()
-
-    def reset(self):
-        self.x = WIDTH // 2
-        self.y = HEIGHT // 2
-        self.num_hits = 0
-        # Random initial direction
-        self.speed_x = random.choice([-BALL_SPEED_X, BALL_SPEED_X])
-        self.speed_y = random.choice([-BALL_SPEED_Y, BALL_SPEED_Y])
+# --- Drawing ---
 
-    def move(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
+def lerp(previous, current, alpha):
+    return previous + (current - previous) * alpha
 
-    def draw(self):
-        pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius)
+def paddle_rect(game, side, previous_y, alpha):
+    top = lerp(previous_y[side], game.paddle_y[0, side], alpha)
+    return pygame.Rect(game.paddle_x[0, side], round(top), PADDLE_WIDTH, round(game.paddle_h[0, side]))
 
-    def deflect(self, paddle):
-        speed = math.fabs(self.speed_x) * math.fabs(self.speed_y)
-        maxballspeed = BALL_SPEED_X * BALL_SPEED_Y * MAXBALLMULT
-        # Calculate the relative position of the ball to the paddle's center
-        relative_y = (self.y - (paddle.y + paddle.height / 2)) / (paddle.height / 2)
-        relative_y = max(-1, min(1, relative_y))
-
-        # Calculate the deflection angle based on the relative position
-        deflection_angle = relative_y * MAX_DEFLECTION
-
-        # Reverse the ball's x-direction and increase speed (with a cap)
-        if speed >= maxballspeed:
-            self.speed_x *= -1
-        else:
-            self.speed_x *= -1.05 # -self.speed_x * ((20 + self.num_hits) / 20)
-
-        # Adjust the ball's y-speed based on the deflection angle
-        self.speed_y += deflection_angle
-
-        # Prevent sticking
-        if self.speed_x > 0:
-            self.x = paddle.rect.right + self.radius
-        else:
-            self.x = paddle.rect.left - self.radius
-
-        self.num_hits += 1
-
-        # Increase paddle speed and decrease size after a hit (with caps)
-        paddle.speed = min(paddle.speed * 1.1, PADDLE_SPEED_CAP)
-        paddle.height *= 0.95
-        paddle.update_size()
+def ball_center(game, previous_ball, alpha):
+    x = lerp(previous_ball[0], game.ball_x[0], alpha)
+    y = lerp(previous_ball[1], game.ball_y[0], alpha)
+    return int(x), int(y)
 
 # --- Initialize Game ---
 
-# Create screen with vsync
-screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
+# Create screen with vsync (not every driver offers it)
+try:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE, vsync=int(VSYNC))
+except pygame.error:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
 pygame.display.set_caption("Pong Game")
 
+# Only moving shapes and changed labels are redrawn and pushed to the display
+renderer = DirtyRenderer(screen, font, WHITE, BLACK, full=FULL_REDRAW)
+
 # Clock to control frame rate
 clock = pygame.time.Clock()
 
-# Create paddles and ball
-paddle_left = Paddle(0)
-paddle_right = Paddle(WIDTH - PADDLE_WIDTH)
-ball = Ball()
+# AI difficulty, cycled with the number keys 1-4 (see pong_core.AI_DIFFICULTY)
+difficulty = "normal"
+DIFFICULTY_KEYS = dict(zip((pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4), AI_DIFFICULTY))
 
-# Score tracking
-score_left = 0
-score_right = 0
+# The rules live in pong_core; this window drives a batch of exactly one game.
+game = PongBatch(1, dt=dt, seed=seed, difficulty=difficulty)
+recorder = InputLogWriter(args.record, game, seed, difficulty, SCORE_PAUSE) if args.record else None
 
 # AI state (True = AI on, False = AI off)
 left_ai = True
 right_ai = True
 
+# Simulation time not yet stepped, and the state one tick back for interpolated drawing
+accumulator = 0.0
+previous_ball = (game.ball_x[0], game.ball_y[0])
+previous_paddle_y = game.paddle_y[0].copy()
+
 # --- Game Loop ---
 
 running = True
@@ -173,107 +89,51 @@ while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type in REPAINT_EVENTS:
+            renderer.needs_full = True
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_q:
                 left_ai = not left_ai  # Toggle left AI
-                paddle_left.is_ai = left_ai
             if event.key == pygame.K_p:
                 right_ai = not right_ai  # Toggle right AI
-                paddle_right.is_ai = right_ai
+            if event.key in DIFFICULTY_KEYS:
+                difficulty = DIFFICULTY_KEYS[event.key]
+                game.set_difficulty(difficulty)
 
-    # --- Paddle Movement ---
+    # --- Paddle Input ---
     keys = pygame.key.get_pressed()
-
-    if not left_ai:
-        # Left paddle controls (W/S)
-        if keys[pygame.K_w]:
-            paddle_left.move(-PADDLE_SPEED)
-        if keys[pygame.K_s]:
-            paddle_left.move(PADDLE_SPEED)
-    else:
-        paddle_left.ai_move(ball)  # Control left paddle with AI
-
-    if not right_ai:
-        # Right paddle controls (Up/Down arrows)
-        if keys[pygame.K_UP]:
-            paddle_right.move(-PADDLE_SPEED)
-        if keys[pygame.K_DOWN]:
-            paddle_right.move(PADDLE_SPEED)
-    else:
-        paddle_right.ai_move(ball)  # Control right paddle with AI
-
-    # --- Ball Movement ---
-    ball.move()
-
-    # --- Collision with Top and Bottom Walls ---
-    if ball.y + ball.radius > HEIGHT or ball.y - ball.radius < 0:
-        ball.speed_y *= -1
-
-    # --- Enhanced Collision Detection with Paddles ---
-    # Predict the ball's next position
-    next_ball_rect = pygame.Rect(
-        int(ball.x + ball.speed_x - ball.radius),
-        int(ball.y + ball.speed_y - ball.radius),
-        2 * ball.radius,
-        2 * ball.radius,
-    )
-
-    # Check for collision with the paddles at the next position
-    if next_ball_rect.colliderect(paddle_right.rect):
-        ball.deflect(paddle_right)
-    elif next_ball_rect.colliderect(paddle_left.rect):
-        ball.deflect(paddle_left)
-
-    # --- Check for Scoring ---
-    if ball.x - ball.radius < 0:
-        score_right += 1
-        ball.reset()
-        # Reset paddle size and speed after scoring
-        paddle_left.height = INITIAL_PADDLE_HEIGHT
-        paddle_left.speed = PADDLE_SPEED
-        paddle_left.update_size()
-        paddle_right.height = INITIAL_PADDLE_HEIGHT
-        paddle_right.speed = PADDLE_SPEED
-        paddle_right.update_size()
-        time.sleep(0.5)  # Short pause before restart
-
-    elif ball.x + ball.radius > WIDTH:
-        score_left += 1
-        ball.reset()
-        # Reset paddle size and speed after scoring
-        paddle_left.height = INITIAL_PADDLE_HEIGHT
-        paddle_left.speed = PADDLE_SPEED
-        paddle_left.update_size()
-        paddle_right.height = INITIAL_PADDLE_HEIGHT
-        paddle_right.speed = PADDLE_SPEED
-        paddle_right.update_size()
-        time.sleep(0.5)
-
-    # --- Clear Screen ---
-    screen.fill(BLACK)
+    left_input = keys[pygame.K_s] - keys[pygame.K_w]  # Left paddle controls (W/S)
+    right_input = keys[pygame.K_DOWN] - keys[pygame.K_UP]  # Right paddle controls (Up/Down arrows)
+
+    # --- Simulation: fixed ticks for the time that has passed (the pause after a point is a game state) ---
+    accumulator += min(clock.tick(FPS) / 1000, MAX_FRAME_TIME)
+    while accumulator >= dt:
+        previous_ball = (game.ball_x[0], game.ball_y[0])
+        previous_paddle_y = game.paddle_y[0].copy()
+        if recorder: recorder.append(left_input, right_input, left_ai, right_ai, difficulty)
+        left_scored, right_scored = game.step(left_input, right_input, left_ai, right_ai)
+        if left_scored[0] or right_scored[0]:
+            previous_ball = (game.ball_x[0], game.ball_y[0])  # Don't interpolate across the reset
+        accumulator -= dt
+    alpha = accumulator / dt
 
     # --- Draw Paddles, Ball, and Scores ---
-    pygame.draw.rect(screen, WHITE, paddle_left.rect)
-    pygame.draw.rect(screen, WHITE, paddle_right.rect)
-    ball.draw()
-
-    # Display scores
-    score_display = font.render(f"{score_left} - {score_right}", True, WHITE)
-    screen.blit(score_display, (WIDTH // 2 - score_display.get_width() // 2, 10))
-
-    # Display AI status
-    left_ai_text = "AI" if left_ai else "Manual"
-    right_ai_text = "AI" if right_ai else "Manual"
-    left_ai_display = font.render(f"Left: {left_ai_text}", True, WHITE)
-    right_ai_display = font.render(f"Right: {right_ai_text}", True, WHITE)
-    screen.blit(left_ai_display, (10, 10))
-    screen.blit(right_ai_display, (WIDTH - right_ai_display.get_width() - 10, 10))
+    renderer.rect(paddle_rect(game, LEFT, previous_paddle_y, alpha))
+    renderer.rect(paddle_rect(game, RIGHT, previous_paddle_y, alpha))
+    renderer.circle(ball_center(game, previous_ball, alpha), BALL_RADIUS)
 
-    # --- Update Display ---
-    pygame.display.flip()
+    # Scores and AI status (text surfaces are cached until they change)
+    left_ai_text = f"AI ({difficulty})" if left_ai else "Manual"
+    right_ai_text = f"AI ({difficulty})" if right_ai else "Manual"
+    renderer.label("score", f"{game.score[0, LEFT]} - {game.score[0, RIGHT]}", WIDTH // 2, 10, "center")
+    renderer.label("left_ai", f"Left: {left_ai_text}", 10, 10)
+    renderer.label("right_ai", f"Right: {right_ai_text}", WIDTH - 10, 10, "right")
 
-    # --- Control Frame Rate ---
-    clock.tick(FPS)
+    # --- Update Display (only the dirty rects) ---
+    renderer.present()
 
 # --- Quit Game ---
-pygame.quit()
\ No newline at end of file
+if recorder:
+    recorder.close()
+    print(f"Recorded {recorder.n_ticks} ticks (seed {seed}) to {args.record}")
+pygame.quit()
@@ -1,6 +1,8 @@
 import pygame
 import random
 
+from snake_core import SnakeGame
+
 # Initialize Pygame
 pygame.init()
 
@@ -15,17 +17,13 @@ black = (0, 0, 0)
 white = (255, 255, 255)
 red = (255, 0, 0)
 
-# Snake position and size
-snake_pos = [100, 50]
-snake_body = [[100, 50], [90, 50], [80, 50]]
-
-# Food position
-food_pos = [random.randrange(1, (size[0]//10)) * 10,
-            random.randrange(1, (size[1]//10)) * 10]
-food_spawn = True
+# The rules live in snake_core: a deque body with a per-cell occupancy grid, and food
+# always drawn from the free-cell index
+game = SnakeGame(size, seed=random.randrange(2**32))
+snake_body = game.body
 
 # Snake movement direction
-direction = 'RIGHT'
+direction = game.direction
 change_to = direction
 
 # Snake speed
@@ -52,13 +50,39 @@ def gameOver():
     pygame.quit()
     quit()
 
+# --- Drawing ---
+# After a full redraw only the new head, the vacated tail and the food change each tick,
+# so only those cells are drawn and pushed to the display.
+
+def cell_rect(pos):
+    return pygame.Rect(pos[0], pos[1], 10, 10)
+
+def full_redraw():
+    screen.fill(black)
+    for pos in snake_body:
+        pygame.draw.rect(screen, white, cell_rect(pos))
+    pygame.draw.rect(screen, red, cell_rect(game.food))
+    pygame.display.flip()
+
+def draw_tick(head, tail, new_food):
+    dirty = []
+    if tail is not None:
+        dirty.append(screen.fill(black, cell_rect(tail)))
+    dirty.append(pygame.draw.rect(screen, white, cell_rect(head)))
+    if new_food:
+        dirty.append(pygame.draw.rect(screen, red, cell_rect(game.food)))
+    pygame.display.update(dirty)
+
 # Main game loop
 done = False
+full_redraw()
 
 while not done:
     for event in pygame.event.get():
         if event.type == pygame.QUIT: 
             done = True
+        elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+            full_redraw()
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP and direction != 'DOWN':
                 change_to = 'UP'
@@ -69,51 +93,13 @@ while not done:
             if event.key == pygame.K_RIGHT and direction != 'LEFT':
                 change_to = 'RIGHT'
     
-    # Update the direction
-    direction = change_to
-
-    # Update the snake position
-    if direction == 'UP':
-        snake_pos[1] -= 10
-    if direction == 'DOWN':
-        snake_pos[1] += 10
-    if direction == 'LEFT':
-        snake_pos[0] -= 10
-    if direction == 'RIGHT':
-        snake_pos[0] += 10
-
-    # Snake body growing mechanism
-    snake_body.insert(0, list(snake_pos))
-    if snake_pos[0] == food_pos[0] and snake_pos[1] == food_pos[1]:
-        food_spawn = False
-    else:
-        snake_body.pop()
-    
-    if not food_spawn:
-        food_pos = [random.randrange(1, (size[0]//10)) * 10,
-                    random.randrange(1, (size[1]//10)) * 10]
-    food_spawn = True
-
-    # Fill the screen with black color
-    screen.fill(black)
-
-    # Draw the snake and food
-    for pos in snake_body:
-        pygame.draw.rect(screen, white, [pos[0], pos[1], 10, 10])
-    
-    pygame.draw.rect(screen, red, [food_pos[0], food_pos[1], 10, 10])
-
-    # Check for collisions with the borders
-    if snake_pos[0] < 0 or snake_pos[0] > size[0] - 10 or snake_pos[1] < 0 or snake_pos[1] > size[1] - 10:
+    # Move, grow, respawn food and check the borders and the body (see SnakeGame.step)
+    if not game.step(change_to):
         gameOver()
+    direction = game.direction
 
-    # Check for collisions with itself
-    for block in snake_body[1:]:
-        if snake_pos[0] == block[0] and snake_pos[1] == block[1]:
-            gameOver()
-
-    # Update the display
-    pygame.display.flip()
+    # Erase the tail, draw the new head and any new food, and update just those cells
+    draw_tick(snake_body.head, game.tail, game.ate)
     
     # Set the game speed
     clock.tick(snake_speed)
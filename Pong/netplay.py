@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import random
+import struct
+import time
+from collections import deque
+
+import numpy as np
+
+from pong_core import BALL_RADIUS, HEIGHT, LEFT, PADDLE_SPEED, PADDLE_WIDTH, RIGHT, TICK_RATE, WIDTH, PongBatch
+
+# --- Two-Player Pong over UDP ---
+# The host owns the game: it steps PongBatch with its own input on the left paddle and the
+# remote player's input on the right, and sends the full state back every tick. The client
+# moves its own paddle immediately (prediction) and, whenever state arrives, rebases it on the
+# host's paddle and replays the inputs the host has not applied yet (reconciliation).
+
+# --- PACKETS ---
+# input (client -> host): u8 type, u32 seq of the newest input, f64 client send time, u8 count,
+#                         then i8[count] inputs for seq - count + 1 .. seq (older ones are resent)
+# state (host -> client): u8 type, u32 host tick, u32 last client seq applied, f64 echoed send time,
+#                         f64[4] ball x/y/vx/vy, f64[2] paddle y, f64[2] paddle h,
+#                         f64[2] paddle speed, u16[2] score, u16 paused ticks
+INPUT, STATE = 1, 2
+INPUT_HEADER = struct.Struct("<BIdB")
+STATE_PACKET = struct.Struct("<BIId4d2d2d2d2HH")
+
+DEFAULT_PORT = 50007
+INPUT_REDUNDANCY = 8  # Inputs carried per packet, so one lost packet costs nothing
+MAX_INPUT_BACKLOG = 3  # Queued client inputs the host keeps before skipping ahead to cut latency
+MAX_PENDING = 2 * TICK_RATE  # Unacknowledged inputs the client keeps for replay
+RTT_SMOOTHING = 0.1
+
+
+class NetStats:
+    """Sequence-number bookkeeping for one direction of traffic, plus round-trip time."""
+
+    def __init__(self):
+        self.received = 0
+        self.lost = 0
+        self.late = 0
+        self.last_seq = None
+        self.rtt = None
+        self.rtt_min = float("inf")
+        self.rtt_max = 0.0
+
+    def packet(self, seq):
+        """Record an arriving sequence number; False if it is no newer than one already seen."""
+        if self.last_seq is not None:
+            if seq <= self.last_seq:
+                self.late += 1
+                return False
+            self.lost += seq - self.last_seq - 1
+        self.last_seq = seq
+        self.received += 1
+        return True
+
+    def sample_rtt(self, seconds):
+        self.rtt = seconds if self.rtt is None else self.rtt + RTT_SMOOTHING * (seconds - self.rtt)
+        self.rtt_min = min(self.rtt_min, seconds)
+        self.rtt_max = max(self.rtt_max, seconds)
+
+    def loss_rate(self):
+        expected = self.received + self.lost
+        return self.lost / expected if expected else 0.0
+
+    def summary(self):
+        text = f"loss {self.loss_rate():.1%} ({self.lost}/{self.received + self.lost}), late {self.late}"
+        if self.rtt is not None:
+            text = (f"rtt {self.rtt * 1000:.1f} ms (min {self.rtt_min * 1000:.1f}, "
+                    f"max {self.rtt_max * 1000:.1f}), " + text)
+        return text
+
+
+class LinkEmulator:
+    """Drops and delays outgoing datagrams, to try netplay on loopback under LAN/WAN conditions."""
+
+    def __init__(self, loss=0.0, latency=0.0, jitter=0.0, seed=None):
+        self.loss = loss
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+
+    def wrap(self, transport):
+        loop = asyncio.get_running_loop()
+
+        def send(data, addr=None):
+            if self.rng.random() < self.loss:
+                return
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            if delay > 0:
+                loop.call_later(delay, transport.sendto, data, addr)
+            else:
+                transport.sendto(data, addr)
+        return send
+
+
+class Host(asyncio.DatagramProtocol):
+    """Authoritative side: local player on LEFT, remote player on RIGHT."""
+
+    def __init__(self, game, link=None):
+        self.game = game
+        self.link = link
+        self.stats = NetStats()  # Client input packets
+        self.peer = None
+        self.send = None
+        self.inputs = {}  # Client seq -> input, received but not yet applied
+        self.applied = 0  # Newest client seq applied to the game
+        self.remote_input = 0
+        self.echo = (0.0, 0.0)  # (client send time, local receive time) of the newest input packet
+        self.ticks = 0
+
+    def connection_made(self, transport):
+        self.send = self.link.wrap(transport) if self.link else transport.sendto
+
+    def datagram_received(self, data, addr):
+        if len(data) < INPUT_HEADER.size or data[0] != INPUT:
+            return
+        _, seq, sent, count = INPUT_HEADER.unpack_from(data)
+        if self.peer is None:
+            self.peer = addr
+        if addr != self.peer or not self.stats.packet(seq):
+            return
+        self.echo = (sent, time.perf_counter())
+        for i, value in enumerate(struct.unpack_from(f"<{count}b", data, INPUT_HEADER.size)):
+            input_seq = seq - count + 1 + i
+            if input_seq > self.applied:
+                self.inputs[input_seq] = value
+
+    def tick(self, local_input):
+        """Step the game once and send the state; does nothing until a client has joined."""
+        if self.peer is None:
+            return False
+        # Apply the oldest queued client input; with none queued, hold the last one
+        if len(self.inputs) > MAX_INPUT_BACKLOG:
+            for seq in sorted(self.inputs)[:-MAX_INPUT_BACKLOG]:
+                del self.inputs[seq]
+                self.applied = seq
+        if self.inputs:
+            self.applied = min(self.inputs)
+            self.remote_input = self.inputs.pop(self.applied)
+        self.game.step(local_input, self.remote_input, False, False)
+        self.ticks += 1
+
+        game = self.game
+        sent, received = self.echo
+        # Echo the client's send time plus how long it sat here, so the client sees pure network RTT
+        echo = sent + (time.perf_counter() - received) if sent else 0.0
+        self.send(STATE_PACKET.pack(STATE, self.ticks, self.applied, echo,
+                                    game.ball_x[0], game.ball_y[0], game.ball_vx[0], game.ball_vy[0],
+                                    *game.paddle_y[0], *game.paddle_h[0], *game.paddle_speed[0],
+                                    *game.score[0], game.paused[0]), self.peer)
+        return True
+
+
+class Client(asyncio.DatagramProtocol):
+    """Remote player on RIGHT: predicts its own paddle and reconciles it with host state."""
+
+    def __init__(self, game, link=None):
+        self.game = game
+        self.link = link
+        self.stats = NetStats()  # Host state packets, and the round trip
+        self.send = None
+        self.seq = 0
+        self.recent = deque(maxlen=INPUT_REDUNDANCY)
+        self.pending = deque(maxlen=MAX_PENDING)  # (seq, input, predicted paddle y) not yet applied by the host
+        self.connected = False
+        self.corrections = []  # |predicted - host| paddle y for each acknowledged input, in px
+
+    def connection_made(self, transport):
+        self.send = self.link.wrap(transport) if self.link else transport.sendto
+
+    def predict(self, local_input):
+        # Same paddle rule PongBatch.step applies on the host
+        if self.game.paused[0] == 0:
+            self.game.move_paddles(RIGHT, local_input * PADDLE_SPEED * self.game.dt)
+
+    def tick(self, local_input):
+        self.seq += 1
+        self.recent.append(local_input)
+        self.predict(local_input)
+        self.pending.append((self.seq, local_input, self.game.paddle_y[0, RIGHT]))
+        self.send(INPUT_HEADER.pack(INPUT, self.seq, time.perf_counter(), len(self.recent)) +
+                  struct.pack(f"<{len(self.recent)}b", *self.recent))
+
+    def datagram_received(self, data, addr):
+        if len(data) != STATE_PACKET.size or data[0] != STATE:
+            return
+        fields = STATE_PACKET.unpack(data)
+        _, tick, applied, echo = fields[:4]
+        if not self.stats.packet(tick):
+            return
+        if echo:
+            self.stats.sample_rtt(time.perf_counter() - echo)
+        self.connected = True
+
+        game = self.game
+        game.ball_x[0], game.ball_y[0], game.ball_vx[0], game.ball_vy[0] = fields[4:8]
+        game.paddle_y[0] = fields[8:10]
+        game.paddle_h[0] = fields[10:12]
+        game.paddle_speed[0] = fields[12:14]
+        game.score[0] = fields[14:16]
+        game.paused[0] = fields[16]
+
+        # Reconcile: drop what the host has applied, then replay the rest on top of its paddle
+        while self.pending and self.pending[0][0] <= applied:
+            seq, _, predicted = self.pending.popleft()
+            if seq == applied:
+                self.corrections.append(abs(predicted - game.paddle_y[0, RIGHT]))
+        replayed = []
+        for seq, local_input, _ in self.pending:
+            self.predict(local_input)
+            replayed.append((seq, local_input, game.paddle_y[0, RIGHT]))
+        self.pending = deque(replayed, maxlen=MAX_PENDING)
+
+
+def follow_ball(game, side):
+    """Scripted player for loopback runs: -1, 0 or +1 toward the ball."""
+    offset = game.ball_y[0] - (game.paddle_y[0, side] + game.paddle_h[0, side] / 2)
+    return 0 if abs(offset) < game.paddle_h[0, side] / 8 else (1 if offset > 0 else -1)
+
+
+async def run_loopback(seconds, host_link, client_link, seed):
+    """Host and client in one process over 127.0.0.1, both driven by follow_ball."""
+    loop = asyncio.get_running_loop()
+    host = Host(PongBatch(1, seed=seed), host_link)
+    host_transport, _ = await loop.create_datagram_endpoint(lambda: host, local_addr=("127.0.0.1", 0))
+    port = host_transport.get_extra_info("sockname")[1]
+    client = Client(PongBatch(1), client_link)
+    client_transport, _ = await loop.create_datagram_endpoint(lambda: client, remote_addr=("127.0.0.1", port))
+
+    start = loop.time()
+    for tick in range(round(seconds * TICK_RATE)):
+        host.tick(follow_ball(host.game, LEFT))
+        client.tick(follow_ball(client.game, RIGHT))
+        await asyncio.sleep(max(0.0, start + (tick + 1) / TICK_RATE - loop.time()))
+    await asyncio.sleep(0.2)  # Let in-flight packets land
+    host_transport.close()
+    client_transport.close()
+
+    corrections = np.array(client.corrections or [0.0])
+    print(f"{host.ticks} host ticks over loopback, score {host.game.score[0, LEFT]} - {host.game.score[0, RIGHT]}")
+    print(f"Client -> host inputs: {host.stats.summary()}")
+    print(f"Host -> client state:  {client.stats.summary()}")
+    print(f"Prediction error on acknowledged inputs: mean {corrections.mean():.2f} px, "
+          f"p99 {np.percentile(corrections, 99):.2f} px, max {corrections.max():.2f} px")
+    print(f"Packet sizes: input {INPUT_HEADER.size + INPUT_REDUNDANCY} B, state {STATE_PACKET.size} B")
+
+
+async def play(role, address, port, link):
+    """Windowed game: 'host' plays the left paddle, 'join' the right one. W/S or Up/Down move."""
+    import pygame
+    from pong_render import REPAINT_EVENTS, DirtyRenderer
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
+    pygame.display.set_caption(f"Pong Netplay ({role})")
+    font = pygame.font.Font(None, int(WIDTH / 40))
+    renderer = DirtyRenderer(screen, font)
+
+    loop = asyncio.get_running_loop()
+    game = PongBatch(1)
+    if role == "host":
+        peer = Host(game, link)
+        transport, _ = await loop.create_datagram_endpoint(lambda: peer, local_addr=(address, port))
+    else:
+        peer = Client(game, link)
+        transport, _ = await loop.create_datagram_endpoint(lambda: peer, remote_addr=(address, port))
+
+    status = ""
+    next_tick = loop.time()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type in REPAINT_EVENTS:
+                renderer.needs_full = True
+        keys = pygame.key.get_pressed()
+        local_input = (keys[pygame.K_s] or keys[pygame.K_DOWN]) - (keys[pygame.K_w] or keys[pygame.K_UP])
+        peer.tick(local_input)
+
+        for side in (LEFT, RIGHT):
+            renderer.rect(pygame.Rect(game.paddle_x[0, side], round(game.paddle_y[0, side]),
+                                      PADDLE_WIDTH, round(game.paddle_h[0, side])))
+        renderer.circle((int(game.ball_x[0]), int(game.ball_y[0])), BALL_RADIUS)
+        renderer.label("score", f"{game.score[0, LEFT]} - {game.score[0, RIGHT]}", WIDTH // 2, 10, "center")
+        # Stats change every tick; refresh the label twice a second so its surface stays cached
+        if peer.stats.received % (TICK_RATE // 2) == 0 or not status:
+            connected = peer.peer is not None if role == "host" else peer.connected
+            status = peer.stats.summary() if connected else f"Waiting for the other player on port {port}"
+        renderer.label("status", status, 10, 10)
+        renderer.present()
+
+        next_tick += 1 / TICK_RATE
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    transport.close()
+    pygame.quit()
+    print(peer.stats.summary())
+
+
+if __name__ == "__main__":
+    link_args = argparse.ArgumentParser(add_help=False)
+    link_args.add_argument("--loss", type=float, default=0.0, help="Fraction of outgoing packets to drop")
+    link_args.add_argument("--latency", type=float, default=0.0, help="Extra one-way delay in ms")
+    link_args.add_argument("--jitter", type=float, default=0.0, help="Random extra delay of up to this many ms")
+
+    parser = argparse.ArgumentParser(description="Two-player Pong over UDP.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+    host_mode = modes.add_parser("host", parents=[link_args], help="Host a game (left paddle)")
+    host_mode.add_argument("--bind", default="0.0.0.0")
+    host_mode.add_argument("--port", type=int, default=DEFAULT_PORT)
+    join_mode = modes.add_parser("join", parents=[link_args], help="Join a hosted game (right paddle)")
+    join_mode.add_argument("address")
+    join_mode.add_argument("--port", type=int, default=DEFAULT_PORT)
+    loopback_mode = modes.add_parser("loopback", parents=[link_args],
+                                     help="Headless host and client on 127.0.0.1 with scripted players")
+    loopback_mode.add_argument("--seconds", type=float, default=10.0)
+    loopback_mode.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def make_link(seed=None):
+        if args.loss or args.latency or args.jitter:
+            return LinkEmulator(args.loss, args.latency / 1000, args.jitter / 1000, seed)
+        return None
+
+    if args.mode == "loopback":
+        asyncio.run(run_loopback(args.seconds, make_link(args.seed), make_link(args.seed + 1), args.seed))
+    elif args.mode == "host":
+        asyncio.run(play("host", args.bind, args.port, make_link()))
+    else:
+        asyncio.run(play("join", args.address, args.port, make_link()))
@@ -0,0 +1,268 @@
+import argparse
+import time
+
+import numpy as np
+
+# --- Pong Simulation Core ---
+# Pure game rules, no pygame: every quantity is an array with one entry per game, so one
+# PongBatch can step a single interactive game or thousands of AI-vs-AI games at once.
+
+# Modifiable Screen Dimensions
+SCREEN_SCALE_FACTOR = 1 # Adjust this for overall scaling (0.5, 0.75, 1.0, etc.)
+BASE_WIDTH = 1920
+BASE_HEIGHT = 1080
+WIDTH = int(BASE_WIDTH * SCREEN_SCALE_FACTOR)
+HEIGHT = int(BASE_HEIGHT * SCREEN_SCALE_FACTOR)
+
+# The game was tuned at 300 ticks per second; speeds below are per second.
+REFERENCE_TICK_RATE = 300
+# Collisions are swept, so the simulation stays exact at a much lower tick rate.
+TICK_RATE = 60
+MAX_BOUNCES = 8  # Collision events resolved per game within one tick
+
+# Paddle constants
+PADDLE_WIDTH = WIDTH / 80  # Adjust divisor for paddle width relative to screen width
+INITIAL_PADDLE_HEIGHT = HEIGHT / 5 # Adjust divisor for initial paddle height relative to screen height
+PADDLE_HEIGHT_LIMIT = 0.25  # Minimum paddle height (25% of initial height)
+PADDLE_SPEED = HEIGHT * 1.66 # Initial paddle speed. Adjust multiplier as needed
+PADDLE_SPEED_CAP = PADDLE_SPEED * 4  # Maximum paddle speed after ramp-up (4 times the initial speed)
+PADDLE_X = (0, WIDTH - PADDLE_WIDTH)  # Left and right paddle x positions
+
+# Ball constants
+BALL_RADIUS = WIDTH / 120  # Adjust divisor for ball radius relative to screen width
+BALL_SPEED_X = WIDTH * 1 # Initial horizontal ball speed. Adjust multiplier as needed
+BALL_SPEED_Y = HEIGHT * 1 # Initial vertical ball speed. Adjust multiplier as needed
+MAXBALLMULT = 3 # Maximum ball speed multiplier
+
+# Maximum deflection angle
+MAX_DEFLECTION = 0.66  # (Approximately 30 degrees), in pixels per tick at the reference tick rate
+
+# Seconds the ball waits at the centre after a point, counted in ticks
+SCORE_PAUSE = 0.5
+
+# AI difficulty: standard deviation of the aiming error, as a fraction of the paddle height
+AI_DIFFICULTY = {"easy": 0.6, "normal": 0.3, "hard": 0.1, "perfect": 0.0}
+
+LEFT, RIGHT = 0, 1
+
+
+class PongBatch:
+    def __init__(self, n_games=1, dt=1 / TICK_RATE, seed=None, difficulty="normal", score_pause=SCORE_PAUSE):
+        self.n = n_games
+        self.dt = dt
+        self.pause_ticks = int(round(score_pause / dt))
+        self.rng = np.random.default_rng(seed)
+        self.ball_x = np.zeros(n_games)
+        self.ball_y = np.zeros(n_games)
+        self.ball_vx = np.zeros(n_games)
+        self.ball_vy = np.zeros(n_games)
+        self.num_hits = np.zeros(n_games, dtype=np.int64)
+        # Paddle arrays are (n_games, 2): column 0 is the left paddle, column 1 the right one.
+        self.paddle_x = np.tile(np.array(PADDLE_X), (n_games, 1))
+        self.paddle_y = np.full((n_games, 2), HEIGHT // 2 - INITIAL_PADDLE_HEIGHT // 2)
+        self.paddle_h = np.full((n_games, 2), INITIAL_PADDLE_HEIGHT)
+        self.paddle_speed = np.full((n_games, 2), PADDLE_SPEED)
+        self.score = np.zeros((n_games, 2), dtype=np.int64)
+        self.rallies = 0
+        # Ticks each game stays frozen after a point (a game state, not a sleep)
+        self.paused = np.zeros(n_games, dtype=np.int64)
+        # Predicted intercept y per paddle, recomputed only when the ball's velocity changes
+        self.ai_target = np.full((n_games, 2), HEIGHT / 2)
+        self.ai_stale = np.ones((n_games, 2), dtype=bool)
+        self.ai_error = np.zeros((n_games, 2))
+        self.set_difficulty(difficulty)
+        self.reset_ball(np.ones(n_games, dtype=bool))
+
+    # --- Rules ---
+
+    def reset_ball(self, mask):
+        count = int(mask.sum())
+        self.ball_x[mask] = WIDTH // 2
+        self.ball_y[mask] = HEIGHT // 2
+        self.num_hits[mask] = 0
+        # Random initial direction
+        self.ball_vx[mask] = self.rng.choice([-BALL_SPEED_X, BALL_SPEED_X], count)
+        self.ball_vy[mask] = self.rng.choice([-BALL_SPEED_Y, BALL_SPEED_Y], count)
+        self.ai_stale[mask] = True
+
+    def reset_paddles(self, mask):
+        self.paddle_h[mask] = INITIAL_PADDLE_HEIGHT
+        self.paddle_speed[mask] = PADDLE_SPEED
+
+    def move_paddles(self, side, dy):
+        # Apply speed cap, then keep the paddle within screen bounds
+        step = self.paddle_speed[:, side] * self.dt
+        y = self.paddle_y[:, side] + np.clip(dy, -step, step)
+        self.paddle_y[:, side] = np.clip(y, 0, HEIGHT - self.paddle_h[:, side])
+
+    def set_difficulty(self, name, side=None):
+        """Takes effect at the next prediction, so changing it mid-rally never draws extra randomness."""
+        sides = [LEFT, RIGHT] if side is None else [side]
+        self.ai_error[:, sides] = AI_DIFFICULTY[name]
+
+    def intercepts(self, side, games):
+        """Ball centre y where it reaches this paddle's face, folding wall bounces analytically.
+
+        Games whose ball moves away from the paddle return the screen centre.
+        """
+        x = PADDLE_X[side] + PADDLE_WIDTH + BALL_RADIUS if side == LEFT else PADDLE_X[side] - BALL_RADIUS
+        vx = self.ball_vx[games]
+        t = (x - self.ball_x[games]) / vx
+        y = self.ball_y[games] + self.ball_vy[games] * t
+        # Reflections between the walls turn the straight-line y into a triangle wave
+        span = HEIGHT - 2 * BALL_RADIUS
+        folded = BALL_RADIUS + span - np.abs(np.mod(y - BALL_RADIUS, 2 * span) - span)
+        return np.where(t > 0, folded, HEIGHT / 2)
+
+    def ai_move(self, side, mask):
+        stale = self.ai_stale[:, side] & mask
+        if stale.any():
+            error = self.rng.normal(0, 1, int(stale.sum())) * self.ai_error[stale, side] * self.paddle_h[stale, side]
+            self.ai_target[stale, side] = self.intercepts(side, stale) + error
+            self.ai_stale[stale, side] = False
+        # Centre the paddle on the cached intercept
+        step = self.paddle_speed[:, side] * self.dt
+        target = self.ai_target[:, side] - self.paddle_h[:, side] / 2
+        dy = np.where(mask, np.clip(target - self.paddle_y[:, side], -step, step), 0.0)
+        self.move_paddles(side, dy)
+
+    def deflect(self, side, mask):
+        h = self.paddle_h[mask, side]
+        speed = np.abs(self.ball_vx[mask]) * np.abs(self.ball_vy[mask])
+        maxballspeed = BALL_SPEED_X * BALL_SPEED_Y * MAXBALLMULT
+        # Relative position of the ball to the paddle's center decides the deflection
+        relative_y = np.clip((self.ball_y[mask] - (self.paddle_y[mask, side] + h / 2)) / (h / 2), -1, 1)
+        deflection = relative_y * MAX_DEFLECTION * REFERENCE_TICK_RATE
+
+        # Reverse the ball's x-direction and increase speed (with a cap)
+        self.ball_vx[mask] *= np.where(speed >= maxballspeed, -1, -1.05)
+        self.ball_vy[mask] += deflection
+
+        self.num_hits[mask] += 1
+        self.ai_stale[mask] = True
+        self.rallies += int(mask.sum())
+
+        # Increase paddle speed and decrease size after a hit (with caps)
+        self.paddle_speed[mask, side] = np.minimum(self.paddle_speed[mask, side] * 1.1, PADDLE_SPEED_CAP)
+        self.paddle_h[mask, side] = np.maximum(self.paddle_h[mask, side] * 0.95,
+                                               INITIAL_PADDLE_HEIGHT * PADDLE_HEIGHT_LIMIT)
+
+    def paddle_impacts(self, side, games):
+        """Time of impact of each ball with this paddle's face (inf if it misses).
+
+        The ball is swept as a moving circle against the paddle rect: a hit on the flat face
+        or on one of its two rounded corners. Paddles are held still for the sweep.
+        """
+        x, y = self.ball_x[games], self.ball_y[games]
+        vx, vy = self.ball_vx[games], self.ball_vy[games]
+        top = self.paddle_y[games, side]
+        bottom = top + self.paddle_h[games, side]
+        face = PADDLE_X[side] + PADDLE_WIDTH if side == LEFT else PADDLE_X[side]
+        approaching = vx < 0 if side == LEFT else vx > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Flat face: the ball centre crosses the face offset by the radius
+            t = (face + (BALL_RADIUS if side == LEFT else -BALL_RADIUS) - x) / vx
+            y_face = y + vy * t
+            on_face = approaching & (t >= 0) & (y_face >= top) & (y_face <= bottom)
+
+            # Corners: the centre comes within one radius of the nearest face corner
+            dx = x - face
+            dy = y - np.clip(y_face, top, bottom)
+            a = vx * vx + vy * vy
+            b = dx * vx + dy * vy
+            disc = b * b - a * (dx * dx + dy * dy - BALL_RADIUS**2)
+            t_corner = (-b - np.sqrt(np.maximum(disc, 0))) / a
+            on_corner = approaching & ~on_face & (disc >= 0) & (t_corner >= 0) & (b < 0)
+        return np.where(on_face, t, np.where(on_corner, t_corner, np.inf))
+
+    def wall_impacts(self, games):
+        """Time until each ball's edge reaches the top or bottom wall."""
+        y, vy = self.ball_y[games], self.ball_vy[games]
+        with np.errstate(divide="ignore"):
+            t = np.where(vy < 0, (BALL_RADIUS - y) / vy, (HEIGHT - BALL_RADIUS - y) / vy)
+        return np.where(vy == 0, np.inf, np.maximum(t, 0))
+
+    def sweep_ball(self, games):
+        """Move these games' balls through one tick, resolving wall and paddle hits at their exact time."""
+        remaining = np.full(len(games), self.dt)
+        for _ in range(MAX_BOUNCES):
+            # Only the paddle the ball is heading toward can be hit
+            towards_right = self.ball_vx[games] > 0
+            t_paddle = np.where(towards_right, self.paddle_impacts(RIGHT, games), self.paddle_impacts(LEFT, games))
+            t_wall = self.wall_impacts(games)
+            t_hit = np.minimum(t_paddle, t_wall)
+            hit = t_hit <= remaining
+            advance = np.where(hit, t_hit, remaining)
+            self.ball_x[games] += self.ball_vx[games] * advance
+            self.ball_y[games] += self.ball_vy[games] * advance
+            if not hit.any():
+                return
+            remaining = remaining[hit] - t_hit[hit]
+            wall = hit & (t_wall <= t_paddle)
+            if wall.any():
+                self.ball_vy[games[wall]] *= -1
+                self.ai_stale[games[wall]] = True
+            for side, towards in ((RIGHT, towards_right), (LEFT, ~towards_right)):
+                paddle = hit & ~wall & towards
+                if paddle.any():
+                    mask = np.zeros(self.n, dtype=bool)
+                    mask[games[paddle]] = True
+                    self.deflect(side, mask)
+            games = games[hit]
+        # Out of bounce budget: finish the tick in a straight line
+        self.ball_x[games] += self.ball_vx[games] * remaining
+        self.ball_y[games] += self.ball_vy[games] * remaining
+
+    def step(self, left_input=0, right_input=0, left_ai=True, right_ai=True):
+        """Advance every game by one tick.
+
+        *_input is -1 (up), 0 or +1 (down) for manually driven paddles, *_ai a bool or
+        per-game mask. Games paused after a point only count down. Returns
+        (left_scored, right_scored) boolean arrays.
+        """
+        live = self.paused == 0
+        self.paused[~live] -= 1
+        if not live.any():
+            return np.zeros(self.n, dtype=bool), np.zeros(self.n, dtype=bool)
+        for side, manual, ai in ((LEFT, left_input, left_ai), (RIGHT, right_input, right_ai)):
+            ai = np.broadcast_to(np.asarray(ai, dtype=bool), (self.n,))
+            if not ai.all():
+                self.move_paddles(side, np.where(ai | ~live, 0.0, np.asarray(manual) * PADDLE_SPEED * self.dt))
+            if ai.any():
+                self.ai_move(side, ai & live)
+
+        # --- Ball Movement with swept Wall and Paddle collisions ---
+        self.sweep_ball(np.flatnonzero(live))
+
+        # --- Check for Scoring ---
+        right_scored = live & (self.ball_x - BALL_RADIUS < 0)
+        left_scored = live & ~right_scored & (self.ball_x + BALL_RADIUS > WIDTH)
+        self.score[right_scored, RIGHT] += 1
+        self.score[left_scored, LEFT] += 1
+        scored = left_scored | right_scored
+        if scored.any():
+            self.reset_ball(scored)
+            self.reset_paddles(scored)
+            self.paused[scored] = self.pause_ticks
+        return left_scored, right_scored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many headless AI-vs-AI Pong games at once.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", choices=list(AI_DIFFICULTY), default="normal")
+    args = parser.parse_args()
+
+    batch = PongBatch(args.games, seed=args.seed, difficulty=args.difficulty)
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        batch.step()
+    elapsed = time.perf_counter() - start
+    points = int(batch.score.sum())
+    print(f"{args.games} games x {args.ticks} ticks in {elapsed:.2f} s "
+          f"({args.games * args.ticks / elapsed:,.0f} game-ticks/s)")
+    print(f"Paddle hits: {batch.rallies:,} ({batch.rallies / elapsed:,.0f}/s), points: {points:,}")
+    print(f"Left {int(batch.score[:, LEFT].sum())} - {int(batch.score[:, RIGHT].sum())} Right, "
+          f"{batch.rallies / max(points, 1):.1f} hits per point")
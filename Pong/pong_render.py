@@ -0,0 +1,135 @@
+import argparse
+import os
+import time
+
+import pygame
+
+# --- Dirty-Rectangle Renderer ---
+# Only the paddles, the ball and changed labels are erased and redrawn, and only those
+# regions are pushed to the display. full=True keeps the old fill/render/flip path for comparison.
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+# The window contents were lost or resized: the next frame has to repaint everything
+REPAINT_EVENTS = (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+
+class DirtyRenderer:
+    def __init__(self, screen, font, color=WHITE, background=BLACK, full=False):
+        self.screen = screen
+        self.font = font
+        self.color = color
+        self.background = background
+        self.full = full
+        self.shapes = []  # Queued this frame: ("rect", rect) or ("circle", center, radius)
+        self.previous = []  # Screen rects covered by last frame's shapes
+        self.labels = {}  # key -> [text, surface, rect, rect to erase before redrawing or None]
+        self.needs_full = True
+
+    def rect(self, rect):
+        self.shapes.append(("rect", rect))
+
+    def circle(self, center, radius):
+        self.shapes.append(("circle", center, radius))
+
+    def label(self, key, text, x, y, align="left"):
+        """Place a text label; the surface is only re-rendered when the text changes."""
+        entry = self.labels.get(key)
+        if entry is None or entry[0] != text or self.full:
+            surface = self.font.render(text, True, self.color)
+            rect = surface.get_rect()
+            setattr(rect, {"left": "topleft", "center": "midtop", "right": "topright"}[align], (x, y))
+            old_rect = entry[2] if entry else rect
+            self.labels[key] = [text, surface, rect, old_rect]
+        return self.labels[key][2]
+
+    def _bounds(self, shape):
+        if shape[0] == "rect":
+            return pygame.Rect(shape[1])
+        (x, y), radius = shape[1], shape[2]
+        return pygame.Rect(x - radius - 1, y - radius - 1, 2 * radius + 2, 2 * radius + 2)
+
+    def _draw_shapes(self):
+        drawn = []
+        for shape in self.shapes:
+            if shape[0] == "rect":
+                drawn.append(pygame.draw.rect(self.screen, self.color, shape[1]))
+            else:
+                drawn.append(pygame.draw.circle(self.screen, self.color, shape[1], shape[2]))
+        self.shapes = []
+        return drawn
+
+    def present(self):
+        """Draw the queued frame and push it to the display. Returns the number of rects updated."""
+        if self.full or self.needs_full:
+            self.screen.fill(self.background)
+            self.previous = self._draw_shapes()
+            for entry in self.labels.values():
+                self.screen.blit(entry[1], entry[2])
+                entry[3] = None
+            pygame.display.flip()
+            self.needs_full = False
+            return 1
+
+        # Erase last frame's shapes, old text of changed labels, and every label a shape touches
+        # (text is alpha-blended, so it has to be erased before it is blitted again)
+        erase = list(self.previous)
+        redraw = []
+        for entry in self.labels.values():
+            if entry[3] is not None:
+                erase.append(entry[3])
+                redraw.append(entry)
+        touched = erase + [self._bounds(shape) for shape in self.shapes]
+        for entry in self.labels.values():
+            if entry not in redraw and entry[2].collidelist(touched) != -1:
+                erase.append(entry[2])
+                redraw.append(entry)
+        for rect in erase:
+            self.screen.fill(self.background, rect)
+
+        self.previous = self._draw_shapes()
+        for entry in redraw:
+            self.screen.blit(entry[1], entry[2])
+            entry[3] = None
+        dirty = erase + self.previous + [entry[2] for entry in redraw]
+        pygame.display.update(dirty)
+        return len(dirty)
+
+
+if __name__ == "__main__":
+    # Benchmark: AI-vs-AI frames rendered with full redraws vs dirty rects.
+    parser = argparse.ArgumentParser(description="Compare full-screen and dirty-rect Pong rendering.")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--dummy", action="store_true", help="Use SDL's dummy video driver (no window)")
+    args = parser.parse_args()
+    if args.dummy:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+    from pong_core import BALL_RADIUS, HEIGHT, LEFT, PADDLE_WIDTH, RIGHT, WIDTH, PongBatch
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.Font(None, int(WIDTH / 40))
+    for full in (True, False):
+        renderer = DirtyRenderer(screen, font, full=full)
+        game = PongBatch(1, seed=0)
+        frame_times = []
+        for _ in range(args.frames):
+            pygame.event.pump()
+            game.step()
+            start = time.perf_counter()
+            for side in (LEFT, RIGHT):
+                renderer.rect(pygame.Rect(game.paddle_x[0, side], round(game.paddle_y[0, side]),
+                                          PADDLE_WIDTH, round(game.paddle_h[0, side])))
+            renderer.circle((int(game.ball_x[0]), int(game.ball_y[0])), BALL_RADIUS)
+            renderer.label("score", f"{game.score[0, LEFT]} - {game.score[0, RIGHT]}", WIDTH // 2, 10, "center")
+            renderer.label("left", "Left: AI (normal)", 10, 10)
+            renderer.label("right", "Right: AI (normal)", WIDTH - 10, 10, "right")
+            renderer.present()
+            frame_times.append(time.perf_counter() - start)
+        frame_times.sort()
+        mean = sum(frame_times) / len(frame_times)
+        print(f"{'full redraw' if full else 'dirty rects'}: mean {mean * 1000:.3f} ms, "
+              f"median {frame_times[len(frame_times) // 2] * 1000:.3f} ms, "
+              f"p99 {frame_times[int(len(frame_times) * 0.99)] * 1000:.3f} ms per frame")
+    pygame.quit()
@@ -0,0 +1,207 @@
+import argparse
+import heapq
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from snake_core import CELL, SnakeGame, serpentine_cycle
+
+# --- Snake Autopilot ---
+# The head steps down a BFS distance field that measures every free cell's distance to the food.
+# The field is built once per food and then patched each tick for the two cells that changed:
+# the new head (now blocked) and the vacated tail (now free). A move is only taken if it keeps
+# the body in order along a Hamiltonian cycle, and past SHORTCUT_LIMIT of the board the snake
+# just follows the cycle, so it can always reach its own tail.
+
+INF = 1 << 30
+SHORTCUT_LIMIT = 0.5  # Fraction of the board the snake may fill before it stops taking shortcuts
+SAFETY_GAP = 4  # Free cells kept between the new head and the tail along the cycle
+
+
+class DistanceField:
+    """Steps from every cell to a target over cells whose `blocked` count is zero."""
+
+    def __init__(self, cols, rows, blocked):
+        self.cols = cols
+        self.blocked = blocked
+        self.dist = [INF] * (cols * rows)
+        self.target = None
+        self.neighbors = []
+        for index in range(cols * rows):
+            c, r = index % cols, index // cols
+            self.neighbors.append([index + d for d, ok in ((-cols, r > 0), (cols, r < rows - 1),
+                                                           (-1, c > 0), (1, c < cols - 1)) if ok])
+        self.updated = 0  # Cells whose distance was (re)computed, to compare with full rebuilds
+
+    def reset(self, target):
+        """Full BFS from a new target."""
+        dist = self.dist
+        for i in range(len(dist)):
+            dist[i] = INF
+        self.target = target
+        dist[target] = 0
+        queue = deque([target])
+        while queue:
+            u = queue.popleft()
+            for v in self.neighbors[u]:
+                if dist[v] == INF and not self.blocked[v]:
+                    dist[v] = dist[u] + 1
+                    queue.append(v)
+        self.updated += len(dist)
+
+    def unblock(self, cell):
+        """A cell became free: it and anything reachable through it can only get closer."""
+        dist, blocked = self.dist, self.blocked
+        best = 0 if cell == self.target else min([dist[n] for n in self.neighbors[cell] if not blocked[n]] + [INF]) + 1
+        if best >= dist[cell]:
+            return
+        dist[cell] = best
+        queue = deque([cell])
+        while queue:
+            u = queue.popleft()
+            self.updated += 1
+            for v in self.neighbors[u]:
+                if not blocked[v] and dist[v] > dist[u] + 1:
+                    dist[v] = dist[u] + 1
+                    queue.append(v)
+
+    def block(self, cell):
+        """A cell became blocked: re-derive only the cells whose shortest paths all ran through it."""
+        dist, blocked, neighbors = self.dist, self.blocked, self.neighbors
+        old = dist[cell]
+        dist[cell] = INF
+        if old >= INF:
+            return
+
+        # Cells lose their distance when no neighbour one step closer is left; visiting in
+        # BFS order decides every parent before its children.
+        lost = set()
+        queue = deque(n for n in neighbors[cell] if dist[n] == old + 1)
+        seen = set(queue)
+        while queue:
+            v = queue.popleft()
+            if blocked[v] or any(dist[u] == dist[v] - 1 and not blocked[u] and u not in lost
+                                 for u in neighbors[v]):
+                continue
+            lost.add(v)
+            for w in neighbors[v]:
+                if w not in seen and dist[w] == dist[v] + 1:
+                    seen.add(w)
+                    queue.append(w)
+
+        # Rebuild the lost region from its intact border, closest first
+        heap = []
+        for v in lost:
+            dist[v] = INF
+        for v in lost:
+            best = min([dist[u] for u in neighbors[v] if not blocked[u] and u not in lost] + [INF])
+            if best < INF:
+                dist[v] = best + 1
+                heapq.heappush(heap, (best + 1, v))
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            self.updated += 1
+            for v in neighbors[u]:
+                if v in lost and dist[v] > d + 1:
+                    dist[v] = d + 1
+                    heapq.heappush(heap, (d + 1, v))
+
+
+class Autopilot:
+    def __init__(self, game):
+        body = game.body
+        self.cycle = [r * body.cols + c for c, r in serpentine_cycle(body.cols, body.rows)]
+        self.order = [0] * len(self.cycle)
+        for i, cell in enumerate(self.cycle):
+            self.order[cell] = i
+        self.field = DistanceField(body.cols, body.rows, body.occupancy)
+        self.field.reset(body.cell(game.food))
+
+    def update(self, game):
+        """Patch the distance field after game.step()."""
+        body = game.body
+        if game.ate:
+            self.field.reset(body.cell(game.food))
+            return
+        self.field.block(body.cell(body.head))
+        if game.tail is not None and not body.occupied(game.tail):
+            self.field.unblock(body.cell(game.tail))
+
+    def direction(self, game):
+        body, order, n = game.body, self.order, len(self.cycle)
+        head = body.cell(body.head)
+        tail = body.cell(body.segments[-1])
+        choice = self.cycle[(order[head] + 1) % n]
+        if len(body) < SHORTCUT_LIMIT * n:
+            # Shortcuts must land ahead of the head along the cycle, well short of the tail and
+            # not past the food, so every tick brings the food closer in cycle order too
+            room = (order[tail] - order[head]) % n - SAFETY_GAP
+            food_ahead = (order[body.cell(game.food)] - order[head]) % n
+            dist = self.field.dist
+            for cell in self.field.neighbors[head]:
+                ahead = (order[cell] - order[head]) % n
+                if not body.occupancy[cell] and 0 < ahead < room and ahead <= food_ahead and dist[cell] < dist[choice]:
+                    choice = cell
+        dc = choice % body.cols - head % body.cols
+        return 'RIGHT' if dc == 1 else 'LEFT' if dc == -1 else 'DOWN' if choice > head else 'UP'
+
+
+def play_game(seed, cols, rows, max_ticks):
+    """One autopilot game from the start of the cycle; returns (ticks, length, outcome, field cells updated)."""
+    cycle = serpentine_cycle(cols, rows)
+    start = [[c * CELL, r * CELL] for c, r in cycle[2::-1]]
+    # The cycle covers row and column 0 too, so food may spawn anywhere and 'full' means the whole board
+    game = SnakeGame((cols * CELL, rows * CELL), seed=seed, body=start, direction='RIGHT', food_margin=0)
+    pilot = Autopilot(game)
+    while game.ticks < max_ticks:
+        if not game.step(pilot.direction(game)):
+            break
+        pilot.update(game)
+    return game.ticks, len(game.body), game.dead or 'timeout', pilot.field.updated
+
+
+def run_chunk(seeds, cols, rows, max_ticks):
+    return [play_game(seed, cols, rows, max_ticks) for seed in seeds]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many seeded Snake games with the autopilot in parallel.")
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--cols", type=int, default=24)
+    parser.add_argument("--rows", type=int, default=16, help="Must be even (the Hamiltonian cycle needs it)")
+    parser.add_argument("--max-ticks", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of game 0; game i uses seed + i")
+    args = parser.parse_args()
+    if args.rows % 2:
+        parser.error("--rows must be even")
+
+    workers = args.workers or os.cpu_count()
+    seeds = list(range(args.seed, args.seed + args.games))
+    chunk = max(1, args.games // (workers * 4))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, seeds[lo:lo + chunk], args.cols, args.rows, args.max_ticks)
+                   for lo in range(0, args.games, chunk)]
+        results = [result for f in futures for result in f.result()]
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(r[0] for r in results)
+    outcomes = Counter(r[2] for r in results)
+    cells = args.cols * args.rows
+    print(f"{len(results)} games on {args.cols}x{args.rows} in {elapsed:.2f} s "
+          f"({ticks / elapsed:,.0f} ticks/s, {workers} workers)")
+    print(f"Average length: {sum(r[1] for r in results) / len(results):.1f} of {cells} cells, "
+          f"average game {ticks / len(results):,.0f} ticks")
+    print(f"Outcomes: {outcomes.get('full', 0)} filled the board, "
+          f"{outcomes.get('wall', 0) + outcomes.get('self', 0)} deaths "
+          f"({outcomes.get('wall', 0)} wall, {outcomes.get('self', 0)} self), {outcomes.get('timeout', 0)} timeouts")
+    print(f"Distance field: {sum(r[3] for r in results) / ticks:.1f} cells updated per tick "
+          f"(a full BFS is {cells})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import argparse
+import random
+import time
+from collections import deque
+
+# --- Snake Body ---
+# The body is a deque of (x, y) segments, head first, and every lattice cell keeps a count of
+# the segments on it. Moving, growing and the self-collision test are O(1) whatever the length.
+# Empty cells where food may appear are kept in a swap-remove array with a cell -> slot map,
+# so a free cell can be drawn in O(1) even when the board is nearly full.
+
+CELL = 10  # Pixels per lattice cell
+START_BODY = [[100, 50], [90, 50], [80, 50]]
+DIRECTIONS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+
+
+class SnakeBody:
+    def __init__(self, segments, size, cell=CELL, food_margin=1):
+        self.cell_size = cell
+        self.cols = size[0] // cell
+        self.rows = size[1] // cell
+        self.segments = deque()
+        self.occupancy = bytearray(self.cols * self.rows)
+        self.food_min = food_margin * cell
+        # Food spawns on columns and rows >= food_margin (the game has always skipped row and column 0)
+        self.free = [r * self.cols + c for r in range(food_margin, self.rows) for c in range(food_margin, self.cols)]
+        self.free_slot = [-1] * (self.cols * self.rows)
+        for slot, index in enumerate(self.free):
+            self.free_slot[index] = slot
+        for pos in reversed(segments):
+            self.segments.appendleft(tuple(pos))
+            self._occupy(self.cell(pos))
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    @property
+    def head(self):
+        return self.segments[0]
+
+    def cell(self, pos):
+        return pos[1] // self.cell_size * self.cols + pos[0] // self.cell_size
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.cols * self.cell_size and 0 <= pos[1] < self.rows * self.cell_size
+
+    def occupied(self, pos):
+        return self.occupancy[self.cell(pos)] > 0
+
+    def _occupy(self, index):
+        self.occupancy[index] += 1
+        slot = self.free_slot[index]
+        if slot >= 0:
+            # Swap-remove: the last free cell takes this one's slot
+            last = self.free.pop()
+            if last != index:
+                self.free[slot] = last
+                self.free_slot[last] = slot
+            self.free_slot[index] = -1
+
+    def _vacate(self, index, eligible):
+        self.occupancy[index] -= 1
+        if self.occupancy[index] == 0 and eligible:
+            self.free_slot[index] = len(self.free)
+            self.free.append(index)
+
+    def move(self, pos, grow=False):
+        """Push a new head; unless growing, drop the tail. Returns the dropped tail (or None)."""
+        pos = tuple(pos)
+        self.segments.appendleft(pos)
+        self._occupy(self.cell(pos))
+        if grow:
+            return None
+        tail = self.segments.pop()
+        self._vacate(self.cell(tail), tail[0] >= self.food_min and tail[1] >= self.food_min)
+        return tail
+
+    def random_free_cell(self, rng):
+        """(x, y) of a uniformly chosen empty food cell, or None if the board is full."""
+        if not self.free:
+            return None
+        index = self.free[rng.randrange(len(self.free))]
+        return [index % self.cols * self.cell_size, index // self.cols * self.cell_size]
+
+    def collides(self):
+        """True if the head shares its cell with another segment."""
+        return self.occupancy[self.cell(self.head)] > 1
+
+
+class SnakeGame:
+    """The Snake rules from Test.py without pygame: one step() per tick."""
+
+    def __init__(self, size, seed=None, body=START_BODY, direction='RIGHT', cell=CELL, food_margin=1):
+        self.cell_size = cell
+        self.rng = random.Random(seed)
+        self.body = SnakeBody(body, size, cell, food_margin)
+        self.direction = direction
+        self.food = self.body.random_free_cell(self.rng)
+        self.ticks = 0
+        self.ate = False  # Whether the last step ate the food (and spawned a new one)
+        self.tail = None  # Cell vacated by the last step, if any
+        self.dead = None  # 'wall', 'self' or 'full' once the game is over
+
+    def step(self, direction=None):
+        """Turn (reversing is ignored, like the key handler) and advance one tick; False once over."""
+        if direction is not None and direction != OPPOSITE[self.direction]:
+            self.direction = direction
+        dx, dy = DIRECTIONS[self.direction]
+        x, y = self.body.head
+        head = (x + dx * self.cell_size, y + dy * self.cell_size)
+        self.ticks += 1
+        if not self.body.in_bounds(head):
+            self.dead = 'wall'
+            return False
+        self.ate = list(head) == self.food
+        self.tail = self.body.move(head, grow=self.ate)
+        if self.ate:
+            self.food = self.body.random_free_cell(self.rng)
+            if self.food is None:
+                self.dead = 'full'  # No food cell left (the whole board when food_margin is 0)
+                return False
+        if self.body.collides():
+            self.dead = 'self'
+            return False
+        return True
+
+
+def serpentine_cycle(cols, rows):
+    """Hamiltonian cycle over a cols x rows lattice (rows must be even), as (col, row) cells.
+
+    Row 0 left to right, then back and forth over columns 1.. for the remaining rows, then up column 0.
+    """
+    cycle = [(c, 0) for c in range(cols)]
+    for r in range(1, rows):
+        span = range(cols - 1, 0, -1) if r % 2 else range(1, cols)
+        cycle += [(c, r) for c in span]
+    cycle += [(0, r) for r in range(rows - 1, 0, -1)]
+    return cycle
+
+
+if __name__ == "__main__":
+    # Benchmark: ticks along a Hamiltonian cycle at growing lengths, list body vs SnakeBody.
+    parser = argparse.ArgumentParser(description="Time Snake ticks against body length.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=2000)
+    args = parser.parse_args()
+
+    cols = rows = 2 * int((max(args.lengths) + args.ticks) ** 0.5 / 2 + 2)
+    path = [(c * CELL, r * CELL) for c, r in serpentine_cycle(cols, rows)]
+    size = (cols * CELL, rows * CELL)
+
+    for length in args.lengths:
+        start_body = path[length - 1::-1]
+
+        # The old list body: insert at the front, pop the tail, scan the rest for the head
+        body = [list(pos) for pos in start_body]
+        ticks = max(20, min(args.ticks, 2000000 // length))
+        start = time.perf_counter()
+        for i in range(length, length + ticks):
+            head = list(path[i])
+            body.insert(0, head)
+            body.pop()
+            assert not any(head[0] == block[0] and head[1] == block[1] for block in body[1:])
+        list_tick = (time.perf_counter() - start) / ticks
+
+        snake = SnakeBody(start_body, size)
+        start = time.perf_counter()
+        for i in range(length, length + args.ticks):
+            snake.move(path[i])
+            assert not snake.collides()
+        deque_tick = (time.perf_counter() - start) / args.ticks
+
+        print(f"length {length:>7}: list {list_tick * 1e6:10.1f} us/tick, "
+              f"deque + grid {deque_tick * 1e6:6.2f} us/tick")
+
+    # Food spawning as the board fills: rejection sampling vs the free-cell index
+    rng = random.Random(0)
+    board = [(c * CELL, r * CELL) for c, r in serpentine_cycle(192, 108)]
+    board = board[len(board) // 2:] + board[:len(board) // 2]  # Leave the free cells mid-board
+    for fill in (0.5, 0.9, 0.99, 0.999):
+        length = int(len(board) * fill)
+        snake = SnakeBody(board[length - 1::-1], (192 * CELL, 108 * CELL))
+        spawns = 500
+        start = time.perf_counter()
+        for _ in range(spawns):
+            while True:
+                pos = (rng.randrange(1, 192) * CELL, rng.randrange(1, 108) * CELL)
+                if not snake.occupied(pos):
+                    break
+        rejection = (time.perf_counter() - start) / spawns
+        start = time.perf_counter()
+        for _ in range(spawns):
+            snake.random_free_cell(rng)
+        indexed = (time.perf_counter() - start) / spawns
+        print(f"board {fill:6.1%} full: rejection {rejection * 1e6:8.1f} us/spawn, "
+              f"free-cell index {indexed * 1e6:5.2f} us/spawn")
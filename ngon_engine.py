@@ -0,0 +1,214 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+# --- Many Balls in a Rotating N-gon ---
+# Batched version of the rotating-hexagon demos (test.py, QWQTEST.py, MISTRALL24BTEST.py).
+# The polygon is built once around the origin; each frame one 2x2 rotation matrix places its
+# vertices and edge normals. Signed distances to the edge lines, impact times and the reflection
+# are then computed for every ball against every edge as (balls, edges) arrays, with no per-edge loop.
+
+WIDTH, HEIGHT = 800, 800
+CORNER_PASSES = 3  # Push-out passes after a bounce, enough for a ball wedged in a corner
+
+
+def regular_polygon(sides, radius):
+    """Vertices of a regular polygon around the origin, counter-clockwise on screen."""
+    angles = 2 * np.pi * np.arange(sides) / sides
+    return radius * np.column_stack((np.cos(angles), np.sin(angles)))
+
+
+def rotation_matrix(angle):
+    c, s = math.cos(angle), math.sin(angle)
+    return np.array([[c, -s], [s, c]])
+
+
+class NGonEngine:
+    """Balls bouncing inside a rotating regular polygon, tested against the edges' lines."""
+
+    def __init__(self, n_balls, sides=6, radius=300, center=(WIDTH / 2, HEIGHT / 2), ball_radius=4,
+                 gravity=0.2, elasticity=1.0, rotation_speed=0.01, seed=None):
+        self.center = np.asarray(center, dtype=float)
+        self.radius = radius
+        self.ball_radius = ball_radius
+        self.gravity = gravity
+        self.elasticity = elasticity
+        self.rotation_speed = rotation_speed  # Radians per frame
+        self.rotation = 0.0
+
+        # Polygon template, built once: vertices and inward edge normals
+        self.template = regular_polygon(sides, radius)
+        edges = np.roll(self.template, -1, axis=0) - self.template
+        normals = np.column_stack((-edges[:, 1], edges[:, 0]))
+        normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+        # Point them at the centre (the template is centred on the origin)
+        midpoints = self.template + edges / 2
+        normals[np.einsum("ij,ij->i", normals, midpoints) > 0] *= -1
+        self.template_normals = normals
+        self.place_polygon()
+
+        # Spawn balls uniformly inside the inscribed circle, clear of the walls
+        rng = np.random.default_rng(seed)
+        apothem = radius * math.cos(math.pi / sides)
+        r = (apothem - 2 * ball_radius) * np.sqrt(rng.uniform(0, 1, n_balls))
+        theta = rng.uniform(0, 2 * np.pi, n_balls)
+        self.pos = self.center + np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+        self.vel = rng.normal(0, 3, (n_balls, 2))
+        self.hits = 0
+
+    def place_polygon(self):
+        """Rotate the template into screen space with a single matrix."""
+        rot = rotation_matrix(self.rotation)
+        self.vertices = self.template @ rot.T + self.center
+        self.normals = self.template_normals @ rot.T
+
+    def signed_distances(self, pos):
+        """Distance of every ball centre to every edge's line, positive inside, as (balls, edges).
+
+        The polygon is convex, so a centre is inside exactly when all of its distances are >= 0,
+        and the smallest one is its distance to the nearest wall, vertices included.
+        """
+        rel = pos[:, np.newaxis, :] - self.vertices[np.newaxis, :, :]
+        return np.einsum("bej,ej->be", rel, self.normals)
+
+    def escaped(self):
+        """Number of balls whose centre is outside the polygon."""
+        return int((self.signed_distances(self.pos).min(axis=1) < 0).sum())
+
+    def step(self):
+        # The swept test below covers any ball speed, but treats the walls as already in place;
+        # sub-step the frame so they never move further than a ball radius at once
+        substeps = max(1, math.ceil(abs(self.rotation_speed) * self.radius / self.ball_radius))
+        for _ in range(substeps):
+            self.advance(1 / substeps)
+
+    def advance(self, fraction):
+        """Move the polygon and every ball through `fraction` of a frame."""
+        self.rotation += self.rotation_speed * fraction
+        self.place_polygon()
+        self.vel[:, 1] += self.gravity * fraction
+        start = self.pos.copy()
+        move = self.vel * fraction
+        self.pos += move
+
+        # Swept test against the walls' new placement: each ball resolves against the first
+        # edge it reaches during the frame, however far it travels
+        before = self.signed_distances(start)
+        after = self.signed_distances(self.pos)
+        reached = after < self.ball_radius
+        if not reached.any():
+            return
+        closing = before - after
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(closing > 0, (before - self.ball_radius) / closing, 0.0)
+        t = np.where(reached, np.clip(t, 0.0, 1.0), np.inf)
+        edge = np.argmin(t, axis=1)
+        balls = np.flatnonzero(reached.any(axis=1))
+        edge, t = edge[balls], t[balls, edge[balls]]
+        normal = self.normals[edge]
+
+        # Put the ball at its impact point, just touching the wall
+        impact = start[balls] + t[:, np.newaxis] * move[balls]
+        gap = before[balls, edge] + t * (after[balls, edge] - before[balls, edge])
+        impact += normal * np.maximum(self.ball_radius - gap, 0.0)[:, np.newaxis]
+
+        # Reflect the velocity relative to the moving wall, only if the ball is heading into it
+        contact = impact - normal * self.ball_radius - self.center
+        wall_vel = self.rotation_speed * np.column_stack((-contact[:, 1], contact[:, 0]))
+        approach = np.einsum("ij,ij->i", self.vel[balls] - wall_vel, normal)
+        into = approach < 0
+        self.vel[balls[into]] -= ((1 + self.elasticity) * approach[into])[:, np.newaxis] * normal[into]
+        self.hits += int(into.sum())
+
+        # Spend the rest of the frame on the new velocity, then push out of any wall it reaches
+        # on the way (a corner takes a pass per wall)
+        pos = impact + ((1 - t) * fraction)[:, np.newaxis] * self.vel[balls]
+        for _ in range(CORNER_PASSES):
+            penetration = self.ball_radius - self.signed_distances(pos)
+            deepest = np.argmax(penetration, axis=1)
+            depth = penetration[np.arange(len(pos)), deepest]
+            if not (depth > 0).any():
+                break
+            pos += self.normals[deepest] * np.maximum(depth, 0.0)[:, np.newaxis]
+        self.pos[balls] = pos
+
+
+def scalar_step(engine):
+    """The single-ball approach of the original demos, looped over balls and edges, for comparison."""
+    engine.rotation += engine.rotation_speed
+    engine.place_polygon()
+    vertices = engine.vertices.tolist()
+    normals = engine.normals.tolist()
+    radius = engine.ball_radius
+    for pos, vel in zip(engine.pos, engine.vel):
+        vel[1] += engine.gravity
+        pos += vel
+        x, y = pos
+        for i in range(len(vertices)):
+            ax, ay = vertices[i]
+            bx, by = vertices[(i + 1) % len(vertices)]
+            abx, aby = bx - ax, by - ay
+            t = max(0.0, min(1.0, ((x - ax) * abx + (y - ay) * aby) / (abx * abx + aby * aby)))
+            dist = math.hypot(x - (ax + t * abx), y - (ay + t * aby))
+            if dist < radius:
+                nx, ny = normals[i]
+                pos[0] += nx * (radius - dist)
+                pos[1] += ny * (radius - dist)
+                dot = vel[0] * nx + vel[1] * ny
+                if dot < 0:
+                    vel[0] -= 2 * dot * nx
+                    vel[1] -= 2 * dot * ny
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Thousands of balls bouncing in a rotating regular polygon.")
+    parser.add_argument("--balls", type=int, default=5000)
+    parser.add_argument("--sides", type=int, default=6)
+    parser.add_argument("--frames", type=int, default=300, help="Frames to time when benchmarking")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--show", action="store_true", help="Open a window instead of benchmarking")
+    args = parser.parse_args()
+
+    engine = NGonEngine(args.balls, args.sides, seed=args.seed)
+    if args.show:
+        import pygame
+
+        pygame.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption(f"{args.balls} Balls in a Rotating {args.sides}-gon")
+        clock = pygame.time.Clock()
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            engine.step()
+            screen.fill((0, 0, 0))
+            pygame.draw.polygon(screen, (0, 0, 255), engine.vertices.tolist(), 2)
+            for x, y in engine.pos.astype(int).tolist():
+                pygame.draw.circle(screen, (255, 0, 0), (x, y), engine.ball_radius)
+            pygame.display.flip()
+            clock.tick(60)
+        pygame.quit()
+    else:
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            engine.step()
+        batched = (time.perf_counter() - start) / args.frames
+        escaped = engine.escaped()
+
+        reference = NGonEngine(min(args.balls, 500), args.sides, seed=args.seed)
+        frames = max(1, args.frames // 10)
+        start = time.perf_counter()
+        for _ in range(frames):
+            scalar_step(reference)
+        per_ball = (time.perf_counter() - start) / frames / len(reference.pos)
+
+        print(f"{args.balls} balls, {args.sides}-gon: {batched * 1000:.2f} ms/frame batched "
+              f"({args.balls / batched:,.0f} ball-steps/s), {engine.hits:,} wall bounces, {escaped} outside")
+        print(f"Per-ball Python loop: {per_ball * 1e6:.1f} us/ball, about {per_ball * args.balls * 1000:.1f} ms/frame "
+              f"for {args.balls} balls ({per_ball * args.balls / batched:.0f}x slower)")
+        if escaped:
+            raise SystemExit(f"{escaped} balls escaped the polygon")